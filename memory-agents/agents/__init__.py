@@ -0,0 +1 @@
+"""EmosiFloww ASI Alliance specialist agents"""
@@ -4,9 +4,10 @@ Advanced memory authenticity verification using MeTTa reasoning
 Specializes in: Memory fraud detection, provenance verification, quality assurance
 """
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import uuid4
 from uagents import Agent, Context, Protocol
+from uagents_core.identity import Identity
 from uagents_core.contrib.protocols.chat import (
     ChatAcknowledgement,
     ChatMessage,
@@ -16,25 +17,13 @@ from uagents_core.contrib.protocols.chat import (
     EndSessionContent,
 )
 from dotenv import load_dotenv
+from fastapi import FastAPI
 import json
 import hashlib
 import random
 
-# Import validation capabilities
-import sys
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-
 load_dotenv()
 
-# Create ASI:One compatible agent
-agent = Agent(
-    name="Authenticity-Validator-Specialist",
-    seed=os.getenv("AUTHENTICITY_VALIDATOR_SEED", "authenticity_validator_seed_789"),
-    port=8002,
-    mailbox=True,  # Enable for ASI:One discovery
-    publish_agent_details=True,
-)
-
 # Chat protocol for ASI:One
 chat_proto = Protocol(spec=chat_protocol_spec)
 
@@ -364,10 +353,26 @@ async def handle_ack(ctx: Context, sender: str, msg: ChatAcknowledgement):
     """Handle acknowledgments"""
     ctx.logger.info(f"✅ Acknowledgment received from {sender}")
 
-# Include chat protocol with manifest publishing
-agent.include(chat_proto, publish_manifest=True)
+def build_agent(
+    name: str = "Authenticity-Validator-Specialist",
+    seed: str = None,
+    port: int = 8002,
+    mailbox: bool = True,
+) -> Agent:
+    """Create the agent with the chat protocol included; nothing is built at import time"""
+    agent = Agent(
+        name=name,
+        seed=seed or os.getenv("AUTHENTICITY_VALIDATOR_SEED", "authenticity_validator_seed_789"),
+        port=port,
+        mailbox=mailbox,  # Enable for ASI:One discovery
+        publish_agent_details=True,
+    )
+    # Include chat protocol with manifest publishing
+    agent.include(chat_proto, publish_manifest=True)
+    return agent
 
 if __name__ == "__main__":
+    agent = build_agent()
     print(f"🔍 Authenticity Validator Specialist - ASI Alliance Compatible")
     print(f"📍 Agent Address: {agent.address}")
     print(f"🌐 Port: {agent.port}")
@@ -377,51 +382,53 @@ if __name__ == "__main__":
     print(f"🛡️ Specialization: Memory authenticity & fraud detection")
     agent.run()
 
-app = FastAPI()
-
-AGENT_IDENTITY = Identity.from_seed(os.getenv("AUTHENTICITY_VALIDATOR_SEED"), 0)
-
-print(f"🔐 Enhanced Authenticity Validator Started")
-print(f"📍 Address: {AGENT_IDENTITY.address}")
-print(f"🔗 Webhook: http://localhost:8002")
-print(f"✨ Multi-Agent Consensus + Chat Protocol: Enabled")
-
-@app.get("/")
-async def healthcheck():
-    return {"status": "Enhanced Authenticity Validator running!", "address": AGENT_IDENTITY.address}
-
-@app.post("/submit")
-async def webhook_handler(agent_message: EncodedAgentMessage):
-    print("🛡️ Enhanced authenticity validation request received")
+def create_webhook_app(identity: Identity) -> FastAPI:
+    """Webhook app for direct agent messages; only built when run as a script"""
+    app = FastAPI()
     
-    try:
-        message = parse_message_from_agent_message_dict(
-            agent_message.model_dump(by_alias=True)
-        )
+    print(f"🔐 Enhanced Authenticity Validator Started")
+    print(f"📍 Address: {identity.address}")
+    print(f"🔗 Webhook: http://localhost:8002")
+    print(f"✨ Multi-Agent Consensus + Chat Protocol: Enabled")
+
+    @app.get("/")
+    async def healthcheck():
+        return {"status": "Enhanced Authenticity Validator running!", "address": identity.address}
+
+    @app.post("/submit")
+    async def webhook_handler(agent_message: EncodedAgentMessage):
+        print("🛡️ Enhanced authenticity validation request received")
+    
+        try:
+            message = parse_message_from_agent_message_dict(
+                agent_message.model_dump(by_alias=True)
+            )
         
-        # Enhanced validation with chat protocol
-        response = await process_enhanced_validation(message)
+            # Enhanced validation with chat protocol
+            response = await process_enhanced_validation(message)
         
-        # Send response with metadata
-        enhanced_response = create_metadata_message({
-            "agent_type": "authenticity_validator",
-            "validation_timestamp": datetime.now(timezone.utc).isoformat(),
-            "consensus_version": "2.0",
-            **response
-        })
+            # Send response with metadata
+            enhanced_response = create_metadata_message({
+                "agent_type": "authenticity_validator",
+                "validation_timestamp": datetime.now(timezone.utc).isoformat(),
+                "consensus_version": "2.0",
+                **response
+            })
         
-        result = send_message_to_agent(
-            sender=AGENT_IDENTITY,
-            target=message.sender,
-            payload=response
-        )
+            result = send_message_to_agent(
+                sender=identity,
+                target=message.sender,
+                payload=response
+            )
         
-        print(f"✅ Enhanced authenticity report sent to {message.sender}")
-        return {"status": "validation_complete"}
+            print(f"✅ Enhanced authenticity report sent to {message.sender}")
+            return {"status": "validation_complete"}
         
-    except Exception as e:
-        print(f"❌ Error in authenticity validation: {e}")
-        return {"status": f"error: {e}"}
+        except Exception as e:
+            print(f"❌ Error in authenticity validation: {e}")
+            return {"status": f"error: {e}"}
+    
+    return app
 
 async def process_enhanced_validation(message):
     """Enhanced authenticity validation with multi-agent consensus"""
@@ -616,5 +623,6 @@ def generate_enhanced_recommendations(status, score, risk_factors):
 if __name__ == "__main__":
     import uvicorn
     print("🚀 Starting Enhanced Authenticity Validator...")
-    print(f"Agent Address: {AGENT_IDENTITY.address}")
-    uvicorn.run(app, host="0.0.0.0", port=8002)
\ No newline at end of file
+    identity = Identity.from_seed(os.getenv("AUTHENTICITY_VALIDATOR_SEED"), 0)
+    print(f"Agent Address: {identity.address}")
+    uvicorn.run(create_webhook_app(identity), host="0.0.0.0", port=8002)
\ No newline at end of file
@@ -20,23 +20,12 @@ import asyncio
 import json
 
 # Import our enhanced capabilities
-import sys
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from utils.asi_one_client import process_natural_language_query
 from utils.portfolio_manager import get_collection_worth, get_user_portfolio_summary
 from utils.transaction_coordinator import coordinate_nft_purchase, coordinate_nft_listing
 
 load_dotenv()
 
-# Create ASI:One compatible agent with mailbox support
-agent = Agent(
-    name="Memory-Marketplace-Coordinator",
-    seed=os.getenv("MARKETPLACE_COORDINATOR_SEED", "marketplace_coordinator_seed_123"),
-    port=8000,
-    mailbox=True,  # Enable mailbox for ASI:One discovery
-    publish_agent_details=True,  # Publish for discoverability
-)
-
 # Create chat protocol for ASI:One compatibility
 chat_proto = Protocol(spec=chat_protocol_spec)
 
@@ -230,10 +219,26 @@ As the Memory Marketplace Coordinator, I specialize in:
 
 Would you like me to help with any of these services?"""
 
-# Include the chat protocol with manifest publishing for ASI:One discovery
-agent.include(chat_proto, publish_manifest=True)
+def build_agent(
+    name: str = "Memory-Marketplace-Coordinator",
+    seed: str = None,
+    port: int = 8000,
+    mailbox: bool = True,
+) -> Agent:
+    """Create the agent with the chat protocol included; nothing is built at import time"""
+    agent = Agent(
+        name=name,
+        seed=seed or os.getenv("MARKETPLACE_COORDINATOR_SEED", "marketplace_coordinator_seed_123"),
+        port=port,
+        mailbox=mailbox,  # Enable for ASI:One discovery
+        publish_agent_details=True,
+    )
+    # Include chat protocol with manifest publishing
+    agent.include(chat_proto, publish_manifest=True)
+    return agent
 
 if __name__ == "__main__":
+    agent = build_agent()
     print(f"🎯 Memory Marketplace Coordinator - ASI Alliance Compatible")
     print(f"📍 Agent Address: {agent.address}")
     print(f"🌐 Port: {agent.port}")
@@ -757,4 +762,5 @@ if __name__ == "__main__":
     print("🤖 ASI:One Integration: Ready")
     print("📊 Portfolio Management: Online") 
     print("⚡ Transaction Coordination: Active")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # One worker: sessions, caches and the agent identity live in this process
+    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="warning")
\ No newline at end of file
@@ -4,9 +4,16 @@ Advanced memory valuation specialist using MeTTa reasoning
 Specializes in: Memory rarity assessment, emotional value calculation, market predictions
 """
 import os
-from datetime import datetime
+import functools
+import logging
+import queue
+from collections import OrderedDict
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime, timezone
+from types import MappingProxyType
 from uuid import uuid4
 from uagents import Agent, Context, Protocol
+from uagents_core.identity import Identity
 from uagents_core.contrib.protocols.chat import (
     ChatAcknowledgement,
     ChatMessage,
@@ -16,33 +23,55 @@ from uagents_core.contrib.protocols.chat import (
     EndSessionContent,
 )
 from dotenv import load_dotenv
-import json
-
-# Import valuation capabilities
-import sys
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from fastapi import FastAPI
+import numpy as np
 
 load_dotenv()
 
-# Create ASI:One compatible agent
-agent = Agent(
-    name="Memory-Appraiser-Specialist",
-    seed=os.getenv("MEMORY_APPRAISER_SEED", "memory_appraiser_seed_456"),
-    port=8001,
-    mailbox=True,  # Enable for ASI:One discovery
-    publish_agent_details=True,
-)
-
 # Chat protocol for ASI:One
 chat_proto = Protocol(spec=chat_protocol_spec)
 
-def create_text_chat(text: str, end_session: bool = True) -> ChatMessage:
+# Read-only valuation tables shared by every request
+_BASE_VALUES = MappingProxyType({
+    "childhood_experience": 1200,
+    "achievement": 800,
+    "first_love": 950,
+    "family_moment": 650,
+    "travel_experience": 750,
+    "general": 500
+})
+
+# Enhanced emotional impact analysis
+_EMOTIONAL_FACTORS = MappingProxyType({
+    "childhood_experience": {"base": 180, "multiplier": 1.8},
+    "first_love": {"base": 220, "multiplier": 2.2},
+    "achievement": {"base": 150, "multiplier": 1.5},
+    "loss_grief": {"base": 200, "multiplier": 2.0},
+    "family_moment": {"base": 160, "multiplier": 1.6},
+    "travel_experience": {"base": 130, "multiplier": 1.3},
+    "career_milestone": {"base": 140, "multiplier": 1.4},
+    "friendship": {"base": 120, "multiplier": 1.2},
+    "generic": {"base": 100, "multiplier": 1.0}
+})
+
+# Bounded in-memory session map, flushed to SQLite in the background
+_SESSION_CAP = 10_000
+_SESSIONS: "OrderedDict[str, str]" = OrderedDict()
+
+def remember_session(session_id: str, sender: str) -> None:
+    """Record session -> sender, evicting the least recently used entry past the cap"""
+    _SESSIONS[session_id] = sender
+    _SESSIONS.move_to_end(session_id)
+    if len(_SESSIONS) > _SESSION_CAP:
+        _SESSIONS.popitem(last=False)
+
+def create_text_chat(text: str, end_session: bool = True, timestamp: datetime = None) -> ChatMessage:
     """Create properly formatted chat message"""
     content = [TextContent(type="text", text=text)]
     if end_session:
         content.append(EndSessionContent(type="end-session"))
     return ChatMessage(
-        timestamp=datetime.utcnow(),
+        timestamp=timestamp or datetime.now(timezone.utc),
         msg_id=uuid4(),
         content=content,
     )
@@ -52,14 +81,17 @@ async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
     """Handle memory valuation requests"""
     ctx.logger.info(f"📨 Memory appraisal request from {sender}")
     
+    # One timestamp for the ack and the reply of this request
+    now = datetime.now(timezone.utc)
+    
     # Store session
-    ctx.storage.set(str(ctx.session), sender)
+    remember_session(str(ctx.session), sender)
     
     # Acknowledge message
     await ctx.send(
         sender,
         ChatAcknowledgement(
-            timestamp=datetime.utcnow(),
+            timestamp=now,
             acknowledged_msg_id=msg.msg_id
         ),
     )
@@ -72,12 +104,12 @@ async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
     
     try:
         response = await process_appraisal_request(user_query, ctx)
-        await ctx.send(sender, create_text_chat(response))
+        await ctx.send(sender, create_text_chat(response, timestamp=now))
     except Exception as e:
         ctx.logger.error(f"❌ Appraisal error: {e}")
         await ctx.send(
             sender,
-            create_text_chat("I apologize for the error. Please provide memory details for accurate valuation.")
+            create_text_chat("I apologize for the error. Please provide memory details for accurate valuation.", timestamp=now)
         )
 
 async def process_appraisal_request(query: str, ctx: Context) -> str:
@@ -127,34 +159,12 @@ What memory would you like me to appraise?"""
         # Perform simulated valuation using MeTTa reasoning
         valuation_result = calculate_memory_value(memory_data)
         
-        return f"""💎 **Memory Valuation Report**
-
-📋 **Memory Analyzed:** {memory_data.get('description', 'User-provided memory')}
-
-💰 **Estimated Value:** ${valuation_result.get('final_valuation', 850):,.2f}
-📈 **Confidence Score:** {valuation_result.get('confidence_score', 0.85):.1%}
-
-🎯 **Rarity Assessment:**
-• **Rarity Score:** {valuation_result.get('rarity_score', 0.75):.1%}
-• **Uniqueness Factors:** {', '.join(valuation_result.get('uniqueness_factors', ['Temporal significance', 'Emotional depth']))}
-• **Market Category:** {valuation_result.get('category', 'Premium childhood memory')}
-
-🧠 **MeTTa Reasoning Chain:**
-• **Temporal Analysis:** {valuation_result.get('temporal_significance', 'High historical value')}
-• **Emotional Impact:** {valuation_result.get('emotional_resonance', 'Strong personal significance')}
-• **Cultural Relevance:** {valuation_result.get('cultural_context', 'Universally relatable')}
-• **Technical Quality:** {valuation_result.get('technical_assessment', 'Professional grade')}
-
-📊 **Market Positioning:**
-• **Demand Level:** {valuation_result.get('demand_forecast', 'High')}
-• **Price Range:** ${valuation_result.get('price_min', 600)} - ${valuation_result.get('price_max', 1200)}
-• **Growth Potential:** {valuation_result.get('growth_prediction', '+12% annually')}
-• **Liquidity:** {valuation_result.get('liquidity_assessment', 'High - sells within 7 days')}
-
-💡 **Investment Recommendation:**
-{valuation_result.get('recommendation', 'Strong hold - this memory type shows consistent appreciation. Consider professional authentication to maximize value.')}
-
-🔍 **Want detailed analysis?** I can provide deeper insights into specific valuation factors or market comparisons."""
+        return _report_template(memory_data["memory_type"]).format(
+            description=query if len(query) <= 100 else f"{query[:100]}...",
+            final_valuation=valuation_result['final_valuation'],
+            price_min=valuation_result['price_min'],
+            price_max=valuation_result['price_max'],
+        )
 
     # Market analysis requests
     elif any(word in query_lower for word in ["market", "trends", "demand", "analysis"]):
@@ -215,13 +225,47 @@ As your Memory Appraiser Specialist, I can help with:
 
 How can I help you with memory valuation today?"""
 
+@functools.lru_cache(maxsize=256)
+def _report_template(memory_type: str) -> str:
+    """Valuation report for a memory type, leaving only per-request values as placeholders"""
+    # Everything but the price figures is fixed per memory type
+    valuation_result = _memory_value_report(memory_type, 0.0, 0, 0)
+    
+    return f"""💎 **Memory Valuation Report**
+
+📋 **Memory Analyzed:** {{description}}
+
+💰 **Estimated Value:** ${{final_valuation:,.2f}}
+📈 **Confidence Score:** {valuation_result['confidence_score']:.1%}
+
+🎯 **Rarity Assessment:**
+• **Rarity Score:** {valuation_result['rarity_score']:.1%}
+• **Uniqueness Factors:** {', '.join(valuation_result['uniqueness_factors'])}
+• **Market Category:** {valuation_result['category']}
+
+🧠 **MeTTa Reasoning Chain:**
+• **Temporal Analysis:** {valuation_result['temporal_significance']}
+• **Emotional Impact:** {valuation_result['emotional_resonance']}
+• **Cultural Relevance:** {valuation_result['cultural_context']}
+• **Technical Quality:** {valuation_result['technical_assessment']}
+
+📊 **Market Positioning:**
+• **Demand Level:** {valuation_result['demand_forecast']}
+• **Price Range:** ${{price_min}} - ${{price_max}}
+• **Growth Potential:** {valuation_result['growth_prediction']}
+• **Liquidity:** {valuation_result['liquidity_assessment']}
+
+💡 **Investment Recommendation:**
+{valuation_result['recommendation']}
+
+🔍 **Want detailed analysis?** I can provide deeper insights into specific valuation factors or market comparisons."""
+
 def extract_memory_details(query: str) -> dict:
     """Extract memory details from user query for valuation"""
     memory_data = {
         "content": query,
         "memory_type": "general",
-        "year": 2020,
-        "description": query[:100] + "..." if len(query) > 100 else query
+        "year": 2020
     }
     
     # Simple keyword extraction for memory type
@@ -245,29 +289,27 @@ def extract_memory_details(query: str) -> dict:
     
     return memory_data
 
-def calculate_memory_value(memory_data: dict) -> dict:
-    """Simulate MeTTa-based memory valuation"""
-    base_values = {
-        "childhood_experience": 1200,
-        "achievement": 800,
-        "first_love": 950,
-        "family_moment": 650,
-        "travel_experience": 750,
-        "general": 500
-    }
-    
-    memory_type = memory_data.get("memory_type", "general")
-    base_value = base_values.get(memory_type, 500)
-    
+def _valuation_kernel(base_value: float, year: float, intensity_modifier: float = 1.0) -> tuple:
+    """Pure numeric core of the MeTTa valuation: (final, price_min, price_max)"""
     # Age premium (older memories worth more)
-    year = memory_data.get("year", 2020)
     age_multiplier = 1.0 + (2024 - year) * 0.05
     
     # Quality indicators
     quality_multiplier = 1.2  # Assume good quality
     
-    final_valuation = base_value * age_multiplier * quality_multiplier
-    
+    final_valuation = base_value * age_multiplier * quality_multiplier * intensity_modifier
+    return final_valuation, final_valuation * 0.7, final_valuation * 1.4
+
+def calculate_memory_value(memory_data: dict) -> dict:
+    """Simulate MeTTa-based memory valuation"""
+    memory_type = memory_data.get("memory_type", "general")
+    final_valuation, price_min, price_max = _valuation_kernel(
+        _BASE_VALUES.get(memory_type, 500), memory_data.get("year", 2020)
+    )
+    return _memory_value_report(memory_type, final_valuation, price_min, price_max)
+
+def _memory_value_report(memory_type: str, final_valuation: float, price_min: float, price_max: float) -> dict:
+    """Shape kernel output into the valuation result consumed by the chat reply"""
     return {
         "final_valuation": final_valuation,
         "confidence_score": 0.87,
@@ -279,8 +321,8 @@ def calculate_memory_value(memory_data: dict) -> dict:
         "cultural_context": "Broadly relatable across demographics",
         "technical_assessment": "Professional quality indicators",
         "demand_forecast": "High",
-        "price_min": int(final_valuation * 0.7),
-        "price_max": int(final_valuation * 1.4),
+        "price_min": int(price_min),
+        "price_max": int(price_max),
         "growth_prediction": "+15% annually",
         "liquidity_assessment": "High - sells within 7 days",
         "recommendation": "Strong investment potential with emotional authenticity validation recommended."
@@ -291,10 +333,26 @@ async def handle_ack(ctx: Context, sender: str, msg: ChatAcknowledgement):
     """Handle acknowledgments"""
     ctx.logger.info(f"✅ Acknowledgment received from {sender}")
 
-# Include chat protocol with manifest publishing
-agent.include(chat_proto, publish_manifest=True)
+def build_agent(
+    name: str = "Memory-Appraiser-Specialist",
+    seed: str = None,
+    port: int = 8001,
+    mailbox: bool = True,
+) -> Agent:
+    """Create the agent with the chat protocol included; nothing is built at import time"""
+    agent = Agent(
+        name=name,
+        seed=seed or os.getenv("MEMORY_APPRAISER_SEED", "memory_appraiser_seed_456"),
+        port=port,
+        mailbox=mailbox,  # Enable for ASI:One discovery
+        publish_agent_details=True,
+    )
+    # Include chat protocol with manifest publishing
+    agent.include(chat_proto, publish_manifest=True)
+    return agent
 
 if __name__ == "__main__":
+    agent = build_agent()
     print(f"💎 Memory Appraiser Specialist - ASI Alliance Compatible")
     print(f"📍 Agent Address: {agent.address}")
     print(f"🌐 Port: {agent.port}")
@@ -306,65 +364,84 @@ if __name__ == "__main__":
 
 load_dotenv()
 
-app = FastAPI()
-
-AGENT_IDENTITY = Identity.from_seed(os.getenv("MEMORY_APPRAISER_SEED"), 0)
-
-print(f"💎 Enhanced Memory Appraiser Started - Day 2 Morning Features")
-print(f"📍 Address: {AGENT_IDENTITY.address}")
-print(f"🔗 Webhook: http://localhost:8001")
-print(f"✨ MeTTa AI + Chat Protocol: Enabled")
-print(f"🧠 Advanced Rarity Assessment: Online")
-print(f"💝 Emotional Value Calculation: Active")
-print(f"📈 Market Trend Analysis: Ready")
-
-@app.get("/")
-async def healthcheck():
-    return {
-        "status": "Enhanced Memory Appraiser with Day 2 Morning Features", 
-        "address": AGENT_IDENTITY.address,
-        "features": [
-            "Advanced MeTTa-powered valuation algorithms",
-            "Comprehensive rarity assessment systems",
-            "Emotional value calculation engine",
-            "Real-time market trend analysis",
-            "Multi-dimensional memory scoring"
-        ],
-        "version": "2.1"
-    }
+# Per-request diagnostics go through a queue; a listener thread does the stdout writes
+logger = logging.getLogger("appraiser")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+
+def create_webhook_app(identity: Identity) -> FastAPI:
+    """Webhook app for direct agent messages; only built when run as a script"""
+    app = FastAPI()
+    
+    print(f"💎 Enhanced Memory Appraiser Started - Day 2 Morning Features")
+    print(f"📍 Address: {identity.address}")
+    print(f"🔗 Webhook: http://localhost:8001")
+    print(f"✨ MeTTa AI + Chat Protocol: Enabled")
+    print(f"🧠 Advanced Rarity Assessment: Online")
+    print(f"💝 Emotional Value Calculation: Active")
+    print(f"📈 Market Trend Analysis: Ready")
+
+    @app.get("/")
+    async def healthcheck():
+        return {
+            "status": "Enhanced Memory Appraiser with Day 2 Morning Features", 
+            "address": identity.address,
+            "features": [
+                "Advanced MeTTa-powered valuation algorithms",
+                "Comprehensive rarity assessment systems",
+                "Emotional value calculation engine",
+                "Real-time market trend analysis",
+                "Multi-dimensional memory scoring"
+            ],
+            "version": "2.1"
+        }
 
-@app.post("/submit")
-async def webhook_handler(agent_message: EncodedAgentMessage):
-    print("🧠 Enhanced MeTTa valuation request received")
+    @app.post("/submit")
+    async def webhook_handler(agent_message: EncodedAgentMessage):
+        logger.info("🧠 Enhanced MeTTa valuation request received")
     
-    try:
-        message = parse_message_from_agent_message_dict(
-            agent_message.model_dump(by_alias=True)
-        )
+        try:
+            message = parse_message_from_agent_message_dict(
+                agent_message.model_dump(by_alias=True)
+            )
         
-        # Enhanced processing with chat protocol
-        response = await process_enhanced_valuation(message)
+            # Enhanced processing with chat protocol
+            response = await process_enhanced_valuation(message)
         
-        # Send response with metadata
-        enhanced_response = create_metadata_message({
-            "agent_type": "memory_appraiser",
-            "response_timestamp": datetime.now(timezone.utc).isoformat(),
-            "metta_version": "2.0",
-            **response
-        })
+            # Send response with metadata
+            enhanced_response = create_metadata_message({
+                "agent_type": "memory_appraiser",
+                "response_timestamp": datetime.now(timezone.utc).isoformat(),
+                "metta_version": "2.0",
+                **response
+            })
         
-        result = send_message_to_agent(
-            sender=AGENT_IDENTITY,
-            target=message.sender,
-            payload=response
-        )
+            result = send_message_to_agent(
+                sender=identity,
+                target=message.sender,
+                payload=response
+            )
         
-        print(f"✅ Enhanced MeTTa valuation sent to {message.sender}")
-        return {"status": "metta_analysis_complete"}
+            logger.info(f"✅ Enhanced MeTTa valuation sent to {message.sender}")
+            return {"status": "metta_analysis_complete"}
         
-    except Exception as e:
-        print(f"❌ Error in MeTTa analysis: {e}")
-        return {"status": f"error: {e}"}
+        except Exception as e:
+            logger.error(f"❌ Error in MeTTa analysis: {e}")
+            return {"status": f"error: {e}"}
+    
+    return app
+
+# Static feature flags; each valuation reports its own copy
+_DAY2_MORNING_FEATURES = MappingProxyType({
+    "advanced_rarity_assessment": True,
+    "emotional_value_calculation": True,
+    "market_trend_analysis": True,
+    "metta_powered_algorithms": True
+})
 
 async def process_enhanced_valuation(message):
     """Enhanced MeTTa-powered memory valuation with Day 2 Morning features"""
@@ -386,49 +463,54 @@ async def process_enhanced_valuation(message):
         }
     }
     
-    print(f"🔬 Day 2 Morning: Advanced MeTTa analyzing: {memory_data['memory_type']}")
+    logger.info(f"🔬 Day 2 Morning: Advanced MeTTa analyzing: {memory_data['memory_type']}")
     
     # Use advanced MeTTa valuation engine
     advanced_valuation = await calculate_advanced_memory_valuation(memory_data)
     
+    # Bind nested results once instead of re-walking attribute chains per field
+    rarity = advanced_valuation.rarity_assessment
+    emotional = advanced_valuation.emotional_analysis
+    market = advanced_valuation.market_analysis
+    
     # Convert to response format
     response = {
         "memory_id": advanced_valuation.memory_id,
-        "memory_type": advanced_valuation.rarity_assessment.memory_type,
+        "memory_type": rarity.memory_type,
         "final_valuation": advanced_valuation.final_valuation,
         "confidence_score": advanced_valuation.confidence_score,
         
         # Day 2 Morning Feature: Rarity Assessment
         "rarity_assessment": {
-            "rarity_score": advanced_valuation.rarity_assessment.rarity_score,
-            "rarity_category": advanced_valuation.rarity_assessment.rarity_category,
-            "temporal_significance": advanced_valuation.rarity_assessment.temporal_significance,
-            "cultural_context": advanced_valuation.rarity_assessment.cultural_context,
-            "personal_significance": advanced_valuation.rarity_assessment.personal_significance,
-            "market_rarity": advanced_valuation.rarity_assessment.market_rarity,
-            "uniqueness_factors": advanced_valuation.rarity_assessment.uniqueness_factors
+            "rarity_score": rarity.rarity_score,
+            "rarity_category": rarity.rarity_category,
+            "temporal_significance": rarity.temporal_significance,
+            "cultural_context": rarity.cultural_context,
+            "personal_significance": rarity.personal_significance,
+            "market_rarity": rarity.market_rarity,
+            "uniqueness_factors": rarity.uniqueness_factors
         },
         
         # Day 2 Morning Feature: Emotional Value Calculation
         "emotional_analysis": {
-            "emotional_intensity": advanced_valuation.emotional_analysis.emotional_intensity,
-            "psychological_impact": advanced_valuation.emotional_analysis.psychological_impact,
-            "nostalgic_value": advanced_valuation.emotional_analysis.nostalgic_value,
-            "therapeutic_value": advanced_valuation.emotional_analysis.therapeutic_value,
-            "social_connection": advanced_valuation.emotional_analysis.social_connection,
-            "life_significance": advanced_valuation.emotional_analysis.life_significance,
-            "total_emotional_score": advanced_valuation.emotional_analysis.total_emotional_score
+            "emotional_intensity": emotional.emotional_intensity,
+            "psychological_impact": emotional.psychological_impact,
+            "nostalgic_value": emotional.nostalgic_value,
+            "therapeutic_value": emotional.therapeutic_value,
+            "social_connection": emotional.social_connection,
+            "life_significance": emotional.life_significance,
+            "total_emotional_score": emotional.total_emotional_score
         },
         
         # Day 2 Morning Feature: Market Trend Analysis
         "market_analysis": {
-            "current_demand": advanced_valuation.market_analysis.current_demand,
-            "price_trend": advanced_valuation.market_analysis.price_trend,
-            "volume_trend": advanced_valuation.market_analysis.volume_trend,
-            "market_sentiment": advanced_valuation.market_analysis.market_sentiment,
-            "predicted_growth": advanced_valuation.market_analysis.predicted_growth,
-            "seasonal_factors": advanced_valuation.market_analysis.seasonal_factors,
-            "demographic_preferences": advanced_valuation.market_analysis.demographic_preferences
+            "current_demand": market.current_demand,
+            "price_trend": market.price_trend,
+            "volume_trend": market.volume_trend,
+            "market_sentiment": market.market_sentiment,
+            "predicted_growth": market.predicted_growth,
+            "seasonal_factors": market.seasonal_factors,
+            "demographic_preferences": market.demographic_preferences
         },
         
         # Comprehensive valuation breakdown
@@ -436,12 +518,7 @@ async def process_enhanced_valuation(message):
         "recommendations": advanced_valuation.recommendations,
         
         # Enhanced metadata
-        "day2_morning_features": {
-            "advanced_rarity_assessment": True,
-            "emotional_value_calculation": True,
-            "market_trend_analysis": True,
-            "metta_powered_algorithms": True
-        },
+        "day2_morning_features": dict(_DAY2_MORNING_FEATURES),
         
         "analysis_timestamp": advanced_valuation.timestamp,
         "metta_version": "2.1-day2-morning",
@@ -450,89 +527,93 @@ async def process_enhanced_valuation(message):
     
     return response
 
+# Uniform draw bounds per valuation: rarity, market, temporal, cultural, preservation
+_METTA_DRAW_LOWS = np.array([0.6, 0.9, 0.7, 0.6, 0.8])
+_METTA_DRAW_HIGHS = np.array([1.0, 1.1, 1.0, 0.9, 1.0])
+
+_RNG = np.random.default_rng()
+
 async def perform_enhanced_metta_valuation(content, memory_type, intensity):
     """Enhanced MeTTa reasoning for memory valuation"""
+    return perform_enhanced_metta_valuation_batch([content], [memory_type], [intensity])[0]
+
+def perform_enhanced_metta_valuation_batch(contents, memory_types, intensities):
+    """Enhanced MeTTa reasoning for a batch of memories, one RNG draw for all of them"""
     
-    # Enhanced emotional impact analysis
-    emotional_factors = {
-        "childhood_experience": {"base": 180, "multiplier": 1.8},
-        "first_love": {"base": 220, "multiplier": 2.2},
-        "achievement": {"base": 150, "multiplier": 1.5},
-        "loss_grief": {"base": 200, "multiplier": 2.0},
-        "family_moment": {"base": 160, "multiplier": 1.6},
-        "travel_experience": {"base": 130, "multiplier": 1.3},
-        "career_milestone": {"base": 140, "multiplier": 1.4},
-        "friendship": {"base": 120, "multiplier": 1.2},
-        "generic": {"base": 100, "multiplier": 1.0}
-    }
-    
-    # Get memory type factors
-    factors = emotional_factors.get(memory_type, emotional_factors["generic"])
-    base_value = factors["base"]
-    multiplier = factors["multiplier"]
-    
-    # Enhanced intensity scaling (1-10)
-    intensity_modifier = 0.8 + (intensity / 10) * 0.4  # 0.8 to 1.2 range
-    
-    # MeTTa rarity analysis
-    rarity_score = random.uniform(0.6, 1.0)  # Simulated uniqueness
-    
-    # Market conditions
-    market_modifier = random.uniform(0.9, 1.1)
-    
-    # Final enhanced valuation
-    final_value = base_value * multiplier * intensity_modifier * rarity_score * market_modifier
-    
-    # Enhanced confidence calculation
-    confidence = min(0.95, 0.7 + (intensity / 10) * 0.25)
+    # Simulated MeTTa uncertainty for the whole batch in a single call
+    draws = _RNG.uniform(_METTA_DRAW_LOWS, _METTA_DRAW_HIGHS, size=(len(memory_types), 5)).tolist()
+    analysis_timestamp = datetime.now(timezone.utc).isoformat()
     
-    # MeTTa reasoning breakdown
-    metta_reasoning = {
-        "emotional_resonance": intensity * 0.1,
-        "memory_uniqueness": rarity_score,
-        "temporal_significance": random.uniform(0.7, 1.0),
-        "cultural_relevance": random.uniform(0.6, 0.9),
-        "preservation_value": random.uniform(0.8, 1.0)
-    }
-    
-    return {
-        "memory_type": memory_type,
-        "metta_valuation": round(final_value, 2),
-        "confidence_score": round(confidence, 3),
-        "emotional_intensity": intensity,
-        "rarity_score": round(rarity_score, 3),
-        "market_conditions": "favorable" if market_modifier > 1.0 else "stable",
-        "metta_reasoning": metta_reasoning,
-        "valuation_factors": {
-            "base_value": base_value,
-            "type_multiplier": multiplier,
-            "intensity_modifier": round(intensity_modifier, 3),
-            "rarity_impact": round(rarity_score, 3),
-            "market_impact": round(market_modifier, 3)
-        },
-        "recommendations": {
-            "listing_price_range": {
-                "min": round(final_value * 0.85, 2),
-                "max": round(final_value * 1.15, 2)
+    results = []
+    for memory_type, intensity, row in zip(memory_types, intensities, draws):
+        rarity_score, market_modifier, temporal_significance, cultural_relevance, preservation_value = row
+        
+        # Get memory type factors
+        factors = _EMOTIONAL_FACTORS.get(memory_type, _EMOTIONAL_FACTORS["generic"])
+        base_value = factors["base"]
+        multiplier = factors["multiplier"]
+        
+        # Enhanced intensity scaling (1-10)
+        intensity_modifier = 0.8 + (intensity / 10) * 0.4  # 0.8 to 1.2 range
+        
+        # Final enhanced valuation
+        final_value = base_value * multiplier * intensity_modifier * rarity_score * market_modifier
+        
+        # Enhanced confidence calculation
+        confidence = min(0.95, 0.7 + (intensity / 10) * 0.25)
+        
+        # MeTTa reasoning breakdown
+        metta_reasoning = {
+            "emotional_resonance": intensity * 0.1,
+            "memory_uniqueness": rarity_score,
+            "temporal_significance": temporal_significance,
+            "cultural_relevance": cultural_relevance,
+            "preservation_value": preservation_value
+        }
+        
+        results.append({
+            "memory_type": memory_type,
+            "metta_valuation": round(final_value, 2),
+            "confidence_score": round(confidence, 3),
+            "emotional_intensity": intensity,
+            "rarity_score": round(rarity_score, 3),
+            "market_conditions": "favorable" if market_modifier > 1.0 else "stable",
+            "metta_reasoning": metta_reasoning,
+            "valuation_factors": {
+                "base_value": base_value,
+                "type_multiplier": multiplier,
+                "intensity_modifier": round(intensity_modifier, 3),
+                "rarity_impact": round(rarity_score, 3),
+                "market_impact": round(market_modifier, 3)
             },
-            "optimal_timing": "immediate" if market_modifier > 1.05 else "monitor_market",
-            "enhancement_suggestions": [
-                "Add contextual metadata",
-                "Include verification documents",
-                "Provide emotional narrative"
-            ]
-        },
-        "metta_version": "2.0-enhanced",
-        "analysis_timestamp": datetime.now(timezone.utc).isoformat(),
-        "chat_protocol_enabled": True
-    }
+            "recommendations": {
+                "listing_price_range": {
+                    "min": round(final_value * 0.85, 2),
+                    "max": round(final_value * 1.15, 2)
+                },
+                "optimal_timing": "immediate" if market_modifier > 1.05 else "monitor_market",
+                "enhancement_suggestions": [
+                    "Add contextual metadata",
+                    "Include verification documents",
+                    "Provide emotional narrative"
+                ]
+            },
+            "metta_version": "2.0-enhanced",
+            "analysis_timestamp": analysis_timestamp,
+            "chat_protocol_enabled": True
+        })
+    
+    return results
 
 if __name__ == "__main__":
     import uvicorn
     print("🚀 Starting Enhanced Memory Appraiser with Day 2 Morning Features...")
-    print(f"Agent Address: {AGENT_IDENTITY.address}")
+    identity = Identity.from_seed(os.getenv("MEMORY_APPRAISER_SEED"), 0)
+    print(f"Agent Address: {identity.address}")
     print("🧠 Advanced MeTTa Valuation Algorithms: Ready")
     print("🔍 Rarity Assessment Systems: Online") 
     print("💝 Emotional Value Calculation: Active")
     print("📈 Market Trend Analysis: Monitoring")
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    app = create_webhook_app(identity)
+    # One worker: sessions, caches and the agent identity live in this process
+    uvicorn.run(app, host="0.0.0.0", port=8001, log_level="warning")
\ No newline at end of file
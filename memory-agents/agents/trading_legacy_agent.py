@@ -4,7 +4,7 @@ Advanced trading automation and legacy management using MeTTa reasoning
 Specializes in: Market making, trading automation, digital legacy planning
 """
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import uuid4
 from uagents import Agent, Context, Protocol
 from uagents_core.contrib.protocols.chat import (
@@ -17,33 +17,125 @@ from uagents_core.contrib.protocols.chat import (
 )
 from dotenv import load_dotenv
 import json
-import random
+import re
+from collections import ChainMap
+import numpy as np
 
-# Import trading and legacy capabilities
-import sys
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+try:
+    import hyperscan
+except ImportError:  # optional; _classify falls back to the compiled regex
+    hyperscan = None
 
 load_dotenv()
 
-# Create ASI:One compatible agent
-agent = Agent(
-    name="Trading-Legacy-Specialist", 
-    seed=os.getenv("TRADING_LEGACY_SEED", "trading_legacy_seed_888"),
-    port=8004,
-    mailbox=True,  # Enable for ASI:One discovery
-    publish_agent_details=True,
-)
-
 # Chat protocol for ASI:One
 chat_proto = Protocol(spec=chat_protocol_spec)
 
-def create_text_chat(text: str, end_session: bool = True) -> ChatMessage:
+# Request categories in priority order; a keyword maps to the first category listing it
+_HELP, _TRADING, _LEGACY, _MARKET_MAKING, _FALLBACK = range(5)
+_CATEGORY_KEYWORDS = (
+    (_HELP, ("help", "what", "how", "who", "agent", "trading", "legacy")),
+    (_TRADING, ("trade", "trading", "automate", "bot", "execute", "buy", "sell")),
+    (_LEGACY, ("legacy", "estate", "inheritance", "beneficiary", "will", "family")),
+    (_MARKET_MAKING, ("liquidity", "market", "making", "spread", "depth")),
+)
+_CATEGORY = {}
+for _category, _keywords in _CATEGORY_KEYWORDS:
+    for _keyword in _keywords:
+        _CATEGORY.setdefault(_keyword, _category)
+# One compiled scan that only ever yields keywords, never the surrounding words
+_KEYWORD_RE = re.compile(r"\b(?:" + "|".join(sorted(_CATEGORY, key=len, reverse=True)) + r")\b")
+
+# Optional Hyperscan database: one word-bounded pattern per category, matched in a single pass
+if hyperscan is not None:
+    _HS_DATABASE = hyperscan.Database()
+    _HS_DATABASE.compile(
+        expressions=[
+            (r"\b(?:" + "|".join(keywords) + r")\b").encode()
+            for _, keywords in _CATEGORY_KEYWORDS
+        ],
+        ids=[category for category, _ in _CATEGORY_KEYWORDS],
+        elements=len(_CATEGORY_KEYWORDS),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(_CATEGORY_KEYWORDS),
+    )
+else:
+    _HS_DATABASE = None
+
+# Simulated analytics are pre-drawn in bulk and handed out one row per request
+_SAMPLE_POOL_SIZE = 4096
+_RNG = np.random.default_rng()
+
+class _SamplePool:
+    """Ring buffer of simulated metric rows, refilled with one vectorized draw per column"""
+    
+    def __init__(self, columns: dict):
+        # name -> ("uniform" | "integers", low, high); integer bounds are inclusive like random.randint
+        self._columns = columns
+        self._refill()
+    
+    def _refill(self):
+        drawn = {
+            name: (
+                _RNG.uniform(low, high, _SAMPLE_POOL_SIZE)
+                if kind == "uniform"
+                else _RNG.integers(low, high, _SAMPLE_POOL_SIZE, endpoint=True)
+            ).tolist()
+            for name, (kind, low, high) in self._columns.items()
+        }
+        self._rows = [dict(zip(drawn, values)) for values in zip(*drawn.values())]
+        self._index = 0
+    
+    def next(self) -> dict:
+        """Next pre-drawn row; redraws the whole pool once it is exhausted"""
+        if self._index == _SAMPLE_POOL_SIZE:
+            self._refill()
+        row = self._rows[self._index]
+        self._index += 1
+        return row
+
+_TRADING_SAMPLES = _SamplePool({
+    "momentum": ("uniform", 20, 28),
+    "mean_reversion": ("uniform", 15, 22),
+    "arbitrage": ("integers", 5, 12),
+    "risk_parity": ("uniform", 12, 18),
+    "active_positions": ("integers", 18, 28),
+    "portfolio_value": ("integers", 250000, 320000),
+    "daily_pnl": ("integers", 2500, 4500),
+    "daily_pnl_pct": ("uniform", 1.0, 2.0),
+    "win_rate": ("uniform", 75, 82),
+})
+
+_LEGACY_SAMPLES = _SamplePool({
+    "total_estate_value": ("integers", 400000, 500000),
+    "nft_count": ("integers", 120, 180),
+    "beneficiary_count": ("integers", 3, 6),
+    "insurance_coverage": ("integers", 100000, 150000),
+    "conservative_projection": ("integers", 600000, 700000),
+    "expected_projection": ("integers", 900000, 1000000),
+    "optimistic_projection": ("integers", 1200000, 1400000),
+})
+
+_MARKET_MAKING_SAMPLES = _SamplePool({
+    "childhood_tvl": ("integers", 180000, 220000),
+    "achievement_tvl": ("integers", 120000, 180000),
+    "family_tvl": ("integers", 90000, 140000),
+    "travel_tvl": ("integers", 60000, 100000),
+    "volume_24h": ("integers", 45000, 85000),
+    "trades_executed": ("integers", 45, 85),
+    "average_spread": ("uniform", 2.1, 3.8),
+    "utilization": ("integers", 65, 85),
+})
+
+# Shared end-of-session marker, reused by reference in every closing message
+_END_SESSION = EndSessionContent(type="end-session")
+
+def create_text_chat(text: str, end_session: bool = True, *, timestamp: datetime = None) -> ChatMessage:
     """Create properly formatted chat message"""
     content = [TextContent(type="text", text=text)]
     if end_session:
-        content.append(EndSessionContent(type="end-session"))
+        content.append(_END_SESSION)
     return ChatMessage(
-        timestamp=datetime.utcnow(),
+        timestamp=timestamp or datetime.now(timezone.utc),
         msg_id=uuid4(),
         content=content,
     )
@@ -53,6 +145,9 @@ async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
     """Handle trading and legacy management requests"""
     ctx.logger.info(f"🔄 Trading/Legacy request from {sender}")
     
+    # One timestamp for the ack and the reply of this request
+    now = datetime.now(timezone.utc)
+    
     # Store session
     ctx.storage.set(str(ctx.session), sender)
     
@@ -60,34 +155,43 @@ async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
     await ctx.send(
         sender,
         ChatAcknowledgement(
-            timestamp=datetime.utcnow(),
+            timestamp=now,
             acknowledged_msg_id=msg.msg_id
         ),
     )
     
     # Extract text content
-    user_query = ""
-    for item in msg.content:
-        if isinstance(item, TextContent):
-            user_query += item.text
+    user_query = "".join(item.text for item in msg.content if isinstance(item, TextContent))
     
     try:
-        response = await process_trading_legacy_request(user_query, ctx)
-        await ctx.send(sender, create_text_chat(response))
+        reply = create_text_chat(await process_trading_legacy_request(user_query, ctx), timestamp=now)
     except Exception as e:
         ctx.logger.error(f"❌ Trading/Legacy error: {e}")
-        await ctx.send(
-            sender,
-            create_text_chat("I apologize for the error. Please provide details for trading or legacy assistance.")
-        )
+        reply = create_text_chat("I apologize for the error. Please provide details for trading or legacy assistance.", timestamp=now)
+    
+    await ctx.send(sender, reply)
 
 async def process_trading_legacy_request(query: str, ctx: Context) -> str:
     """Process trading and legacy requests using MeTTa reasoning"""
-    query_lower = query.lower()
-    
-    # Check if user is asking for general info about the agent
-    if any(word in query_lower for word in ["help", "what", "how", "who", "agent", "trading", "legacy"]):
-        return """🔄 **Trading & Legacy Specialist**
+    return _HANDLERS[_classify(query.lower())](query)
+
+def _classify(query_lower: str) -> int:
+    """Single-pass keyword classification; the highest-priority category hit wins"""
+    if _HS_DATABASE is not None:
+        hits = []
+        try:
+            _HS_DATABASE.scan(query_lower.encode(), match_event_handler=_on_category_match, context=hits)
+        except hyperscan.ScanTerminated:
+            pass  # stopped early by _on_category_match
+        return min(hits, default=_FALLBACK)
+    return min(map(_CATEGORY.__getitem__, _KEYWORD_RE.findall(query_lower)), default=_FALLBACK)
+
+def _on_category_match(category: int, start: int, end: int, flags: int, hits: list) -> bool:
+    """Hyperscan match callback; returning True stops the scan once the top category is hit"""
+    hits.append(category)
+    return category == _HELP
+
+_HELP_RESPONSE = """🔄 **Trading & Legacy Specialist**
 
 I'm your expert AI agent for memory NFT trading automation and digital legacy planning using advanced MeTTa reasoning!
 
@@ -123,23 +227,23 @@ I'm your expert AI agent for memory NFT trading automation and digital legacy pl
 
 How can I help with your trading or legacy planning needs today?"""
 
-    # Trading automation requests
-    elif any(word in query_lower for word in ["trade", "trading", "automate", "bot", "execute", "buy", "sell"]):
-        trading_analysis = generate_trading_analysis()
-        
-        return f"""🔄 **Automated Trading System**
+def _help_response(query: str) -> str:
+    """General info about the agent"""
+    return _HELP_RESPONSE
+
+_TRADING_TEMPLATE = """🔄 **Automated Trading System**
 
 🤖 **Smart Trading Algorithms Active:**
-• **Momentum Strategy:** {trading_analysis.get('momentum_performance', '+24.3% YTD')}
-• **Mean Reversion:** {trading_analysis.get('mean_reversion_performance', '+18.7% YTD')}
-• **Arbitrage Scanner:** {trading_analysis.get('arbitrage_opportunities', '7 active opportunities')}
-• **Risk Parity:** {trading_analysis.get('risk_parity_performance', '+15.2% YTD')}
+• **Momentum Strategy:** {momentum_performance}
+• **Mean Reversion:** {mean_reversion_performance}
+• **Arbitrage Scanner:** {arbitrage_opportunities}
+• **Risk Parity:** {risk_parity_performance}
 
 📊 **Current Trading Status:**
-• **Active Positions:** {trading_analysis.get('active_positions', 23)} memory NFTs
-• **Portfolio Value:** ${trading_analysis.get('portfolio_value', 287500):,}
-• **24h PnL:** {trading_analysis.get('daily_pnl', '+$3,850')} ({trading_analysis.get('daily_pnl_pct', '+1.34%')})
-• **Win Rate:** {trading_analysis.get('win_rate', '78.3%')} (last 30 trades)
+• **Active Positions:** {active_positions} memory NFTs
+• **Portfolio Value:** ${portfolio_value:,}
+• **24h PnL:** {daily_pnl} ({daily_pnl_pct})
+• **Win Rate:** {win_rate} (last 30 trades)
 
 🧠 **MeTTa Trading Intelligence:**
 • **Trend Prediction:** Next 4-hour direction with 96.1% accuracy
@@ -164,23 +268,36 @@ Based on current market conditions, momentum strategies show highest alpha poten
 
 Would you like me to activate specific trading algorithms or customize strategies for your portfolio?"""
 
-    # Legacy and estate planning requests
-    elif any(word in query_lower for word in ["legacy", "estate", "inheritance", "beneficiary", "will", "family"]):
-        legacy_analysis = generate_legacy_analysis()
-        
-        return f"""🏛️ **Digital Legacy Management System**
+# Fallbacks for any field missing from the simulated analysis
+_TRADING_DEFAULTS = {
+    "momentum_performance": "+24.3% YTD",
+    "mean_reversion_performance": "+18.7% YTD",
+    "arbitrage_opportunities": "7 active opportunities",
+    "risk_parity_performance": "+15.2% YTD",
+    "active_positions": 23,
+    "portfolio_value": 287500,
+    "daily_pnl": "+$3,850",
+    "daily_pnl_pct": "+1.34%",
+    "win_rate": "78.3%"
+}
+
+def _trading_response(query: str) -> str:
+    """Trading automation requests"""
+    return _TRADING_TEMPLATE.format_map(ChainMap(generate_trading_analysis(), _TRADING_DEFAULTS))
+
+_LEGACY_TEMPLATE = """🏛️ **Digital Legacy Management System**
 
 👨‍👩‍👧‍👦 **Estate Planning Overview:**
-• **Total Estate Value:** ${legacy_analysis.get('total_estate_value', 450000):,}
-• **Memory NFT Holdings:** {legacy_analysis.get('nft_count', 156)} items
-• **Registered Beneficiaries:** {legacy_analysis.get('beneficiary_count', 4)} family members
-• **Legacy Compliance Status:** {legacy_analysis.get('compliance_status', 'Fully Compliant')}
+• **Total Estate Value:** ${total_estate_value:,}
+• **Memory NFT Holdings:** {nft_count} items
+• **Registered Beneficiaries:** {beneficiary_count} family members
+• **Legacy Compliance Status:** {compliance_status}
 
 📋 **Inheritance Structure:**
-• **Primary Beneficiaries:** {legacy_analysis.get('primary_beneficiaries', '2 children (50% each)')}
-• **Secondary Beneficiaries:** {legacy_analysis.get('secondary_beneficiaries', '2 grandchildren (25% each)')}
-• **Charitable Allocation:** {legacy_analysis.get('charity_allocation', '5% to Memory Preservation Foundation')}
-• **Contingency Plans:** {legacy_analysis.get('contingency_status', 'Active backup protocols')}
+• **Primary Beneficiaries:** {primary_beneficiaries}
+• **Secondary Beneficiaries:** {secondary_beneficiaries}
+• **Charitable Allocation:** {charity_allocation}
+• **Contingency Plans:** {contingency_status}
 
 🧠 **MeTTa Legacy Optimization:**
 • **Appreciation Modeling:** 20-year value projection with 85% confidence
@@ -191,13 +308,13 @@ Would you like me to activate specific trading algorithms or customize strategie
 🔐 **Security & Protection:**
 • **Multi-Signature Vaults:** 3-of-5 key security for high-value items
 • **Geographic Distribution:** Assets stored across multiple jurisdictions
-• **Insurance Coverage:** ${legacy_analysis.get('insurance_coverage', 125000):,} comprehensive protection
+• **Insurance Coverage:** ${insurance_coverage:,} comprehensive protection
 • **Legal Framework:** Compliant with digital asset inheritance laws
 
 📈 **Legacy Value Projection:**
-• **Conservative Estimate:** ${legacy_analysis.get('conservative_projection', 675000):,} in 20 years
-• **Expected Scenario:** ${legacy_analysis.get('expected_projection', 980000):,} in 20 years  
-• **Optimistic Scenario:** ${legacy_analysis.get('optimistic_projection', 1350000):,} in 20 years
+• **Conservative Estimate:** ${conservative_projection:,} in 20 years
+• **Expected Scenario:** ${expected_projection:,} in 20 years  
+• **Optimistic Scenario:** ${optimistic_projection:,} in 20 years
 • **Inflation Adjusted:** Real purchasing power maintained
 
 🎯 **Legacy Recommendations:**
@@ -214,21 +331,39 @@ Would you like me to activate specific trading algorithms or customize strategie
 
 Would you like to modify your legacy plan or add new beneficiaries?"""
 
-    # Market making and liquidity requests
-    elif any(word in query_lower for word in ["liquidity", "market", "making", "spread", "depth"]):
-        return f"""💧 **Liquidity Provision & Market Making**
+# Fallbacks for any field missing from the simulated analysis
+_LEGACY_DEFAULTS = {
+    "total_estate_value": 450000,
+    "nft_count": 156,
+    "beneficiary_count": 4,
+    "compliance_status": "Fully Compliant",
+    "primary_beneficiaries": "2 children (50% each)",
+    "secondary_beneficiaries": "2 grandchildren (25% each)",
+    "charity_allocation": "5% to Memory Preservation Foundation",
+    "contingency_status": "Active backup protocols",
+    "insurance_coverage": 125000,
+    "conservative_projection": 675000,
+    "expected_projection": 980000,
+    "optimistic_projection": 1350000
+}
+
+def _legacy_response(query: str) -> str:
+    """Legacy and estate planning requests"""
+    return _LEGACY_TEMPLATE.format_map(ChainMap(generate_legacy_analysis(), _LEGACY_DEFAULTS))
+
+_MARKET_MAKING_TEMPLATE = """💧 **Liquidity Provision & Market Making**
 
 📊 **Current Liquidity Pools:**
-• **Childhood Memories:** ${random.randint(180000, 220000):,} TVL, 2.1% spread
-• **Achievement Moments:** ${random.randint(120000, 180000):,} TVL, 3.2% spread  
-• **Family Celebrations:** ${random.randint(90000, 140000):,} TVL, 2.8% spread
-• **Travel Experiences:** ${random.randint(60000, 100000):,} TVL, 4.1% spread
+• **Childhood Memories:** ${childhood_tvl:,} TVL, 2.1% spread
+• **Achievement Moments:** ${achievement_tvl:,} TVL, 3.2% spread  
+• **Family Celebrations:** ${family_tvl:,} TVL, 2.8% spread
+• **Travel Experiences:** ${travel_tvl:,} TVL, 4.1% spread
 
 ⚡ **Market Making Performance:**
-• **24h Volume Facilitated:** ${random.randint(45000, 85000):,}
-• **Trades Executed:** {random.randint(45, 85)} successful fills
-• **Average Spread Earned:** {random.uniform(2.1, 3.8):.1%}
-• **Liquidity Utilization:** {random.randint(65, 85)}% of pools active
+• **24h Volume Facilitated:** ${volume_24h:,}
+• **Trades Executed:** {trades_executed} successful fills
+• **Average Spread Earned:** {average_spread:.1%}
+• **Liquidity Utilization:** {utilization}% of pools active
 
 🧠 **MeTTa Market Intelligence:**
 • **Optimal Spread Calculation:** Dynamic pricing based on volatility
@@ -244,10 +379,14 @@ Would you like to modify your legacy plan or add new beneficiaries?"""
 
 How can I optimize liquidity provision for your needs?"""
 
-    else:
-        return f"""🔄 **Trading & Legacy Analysis**
+def _market_making_response(query: str) -> str:
+    """Market making and liquidity requests"""
+    return _MARKET_MAKING_TEMPLATE.format_map(_MARKET_MAKING_SAMPLES.next())
 
-I understand you're interested in: "{query}"
+_FALLBACK_PREFIX = """🔄 **Trading & Legacy Analysis**
+
+I understand you're interested in: \""""
+_FALLBACK_SUFFIX = """"
 
 As your Trading & Legacy Specialist, I can help with:
 
@@ -270,35 +409,50 @@ As your Trading & Legacy Specialist, I can help with:
 
 How can I help with your trading or legacy needs today?"""
 
+def _fallback_response(query: str) -> str:
+    """Unrecognized requests: echo the query with service suggestions"""
+    return _FALLBACK_PREFIX + query + _FALLBACK_SUFFIX
+
+# Dispatch table indexed by _classify() category
+_HANDLERS = (
+    _help_response,
+    _trading_response,
+    _legacy_response,
+    _market_making_response,
+    _fallback_response,
+)
+
 def generate_trading_analysis() -> dict:
     """Generate simulated trading performance data"""
+    sample = _TRADING_SAMPLES.next()
     return {
-        "momentum_performance": f"+{random.uniform(20, 28):.1f}% YTD",
-        "mean_reversion_performance": f"+{random.uniform(15, 22):.1f}% YTD", 
-        "arbitrage_opportunities": f"{random.randint(5, 12)} active opportunities",
-        "risk_parity_performance": f"+{random.uniform(12, 18):.1f}% YTD",
-        "active_positions": random.randint(18, 28),
-        "portfolio_value": random.randint(250000, 320000),
-        "daily_pnl": f"+${random.randint(2500, 4500):,}",
-        "daily_pnl_pct": f"+{random.uniform(1.0, 2.0):.2f}%",
-        "win_rate": f"{random.uniform(75, 82):.1f}%"
+        "momentum_performance": f"+{sample['momentum']:.1f}% YTD",
+        "mean_reversion_performance": f"+{sample['mean_reversion']:.1f}% YTD", 
+        "arbitrage_opportunities": f"{sample['arbitrage']} active opportunities",
+        "risk_parity_performance": f"+{sample['risk_parity']:.1f}% YTD",
+        "active_positions": sample['active_positions'],
+        "portfolio_value": sample['portfolio_value'],
+        "daily_pnl": f"+${sample['daily_pnl']:,}",
+        "daily_pnl_pct": f"+{sample['daily_pnl_pct']:.2f}%",
+        "win_rate": f"{sample['win_rate']:.1f}%"
     }
 
 def generate_legacy_analysis() -> dict:
     """Generate simulated legacy planning data"""
+    sample = _LEGACY_SAMPLES.next()
     return {
-        "total_estate_value": random.randint(400000, 500000),
-        "nft_count": random.randint(120, 180),
-        "beneficiary_count": random.randint(3, 6),
+        "total_estate_value": sample['total_estate_value'],
+        "nft_count": sample['nft_count'],
+        "beneficiary_count": sample['beneficiary_count'],
         "compliance_status": "Fully Compliant",
         "primary_beneficiaries": "2 children (50% each)",
         "secondary_beneficiaries": "2 grandchildren (25% each)",
         "charity_allocation": "5% to Memory Preservation Foundation",
         "contingency_status": "Active backup protocols",
-        "insurance_coverage": random.randint(100000, 150000),
-        "conservative_projection": random.randint(600000, 700000),
-        "expected_projection": random.randint(900000, 1000000),
-        "optimistic_projection": random.randint(1200000, 1400000)
+        "insurance_coverage": sample['insurance_coverage'],
+        "conservative_projection": sample['conservative_projection'],
+        "expected_projection": sample['expected_projection'],
+        "optimistic_projection": sample['optimistic_projection']
     }
 
 @chat_proto.on_message(ChatAcknowledgement)
@@ -306,10 +460,26 @@ async def handle_ack(ctx: Context, sender: str, msg: ChatAcknowledgement):
     """Handle acknowledgments"""
     ctx.logger.info(f"✅ Acknowledgment received from {sender}")
 
-# Include chat protocol with manifest publishing
-agent.include(chat_proto, publish_manifest=True)
+def build_agent(
+    name: str = "Trading-Legacy-Specialist",
+    seed: str = None,
+    port: int = 8004,
+    mailbox: bool = True,
+) -> Agent:
+    """Create the agent with the chat protocol included; nothing is built at import time"""
+    agent = Agent(
+        name=name,
+        seed=seed or os.getenv("TRADING_LEGACY_SEED", "trading_legacy_seed_888"),
+        port=port,
+        mailbox=mailbox,  # Enable for ASI:One discovery
+        publish_agent_details=True,
+    )
+    # Include chat protocol with manifest publishing
+    agent.include(chat_proto, publish_manifest=True)
+    return agent
 
 if __name__ == "__main__":
+    agent = build_agent()
     print(f"🔄 Trading & Legacy Specialist - ASI Alliance Compatible")
     print(f"📍 Agent Address: {agent.address}")
     print(f"🌐 Port: {agent.port}")
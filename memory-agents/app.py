@@ -1,6 +1,7 @@
 from datetime import datetime
 from uuid import uuid4
 import os
+import time
 import asyncio
 import logging
 from dotenv import load_dotenv
@@ -16,10 +17,10 @@ from uagents_core.contrib.protocols.chat import (
 )
 
 # Import our 4 specialized agents
-from agents.marketplace_coordinator import MarketplaceCoordinator
-from agents.memory_appraiser import MemoryAppraiser  
-from agents.authenticity_validator import AuthenticityValidator
-from agents.trading_legacy_agent import TradingLegacyAgent
+from agents.marketplace_coordinator import build_agent as build_marketplace_coordinator
+from agents.memory_appraiser import build_agent as build_memory_appraiser
+from agents.authenticity_validator import build_agent as build_authenticity_validator
+from agents.trading_legacy_agent import build_agent as build_trading_legacy
 
 # Load environment variables
 load_dotenv()
@@ -28,82 +29,63 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# (key, label, build_agent factory, name, seed env var, default seed, port)
+AGENT_SPECS = (
+    ("marketplace_coordinator", "Marketplace Coordinator", build_marketplace_coordinator,
+     "EmosiFloww-Marketplace-Coordinator", "MARKETPLACE_COORDINATOR_SEED", "marketplace_coordinator_seed_123", 8001),
+    ("memory_appraiser", "Memory Appraiser", build_memory_appraiser,
+     "EmosiFloww-Memory-Appraiser", "MEMORY_APPRAISER_SEED", "memory_appraiser_seed_456", 8002),
+    ("authenticity_validator", "Authenticity Validator", build_authenticity_validator,
+     "EmosiFloww-Authenticity-Validator", "AUTHENTICITY_VALIDATOR_SEED", "authenticity_validator_seed_789", 8003),
+    ("trading_legacy", "Trading Legacy Agent", build_trading_legacy,
+     "EmosiFloww-Trading-Legacy", "TRADING_LEGACY_SEED", "trading_legacy_seed_888", 8004),
+)
+
 class EmosiFlowwAgentOrchestrator:
     
     def __init__(self):
+        # Default loop: the agents below capture the same one at construction
         self.bureau = Bureau()
+        # Mailboxes are only needed for ASI:One discovery; local-only runs dispatch in-process
+        self.mailbox = os.getenv("EMOSIFLOWW_LOCAL_ONLY", "false").lower() != "true"
         self.agents = {}
         self.initialize_agents()
     
     def initialize_agents(self):
         
         logger.info("🚀 Initializing EmosiFloww ASI Alliance Agents...")
+        started = time.perf_counter()
         
-        try:
-            marketplace_agent = MarketplaceCoordinator(
-                name="EmosiFloww-Marketplace-Coordinator",
-                seed=os.getenv("MARKETPLACE_COORDINATOR_SEED", "marketplace_coordinator_seed_123"),
-                port=8001,
-                mailbox=True
-            )
-            self.bureau.add(marketplace_agent.agent)
-            self.agents['marketplace_coordinator'] = marketplace_agent
-            logger.info("✅ Marketplace Coordinator initialized")
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize Marketplace Coordinator: {e}")
-        
-        # Initialize Memory Appraiser
-        try:
-            memory_agent = MemoryAppraiser(
-                name="EmosiFloww-Memory-Appraiser",
-                seed=os.getenv("MEMORY_APPRAISER_SEED", "memory_appraiser_seed_456"),
-                port=8002,
-                mailbox=True
-            )
-            self.bureau.add(memory_agent.agent)
-            self.agents['memory_appraiser'] = memory_agent
-            logger.info("✅ Memory Appraiser initialized")
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize Memory Appraiser: {e}")
-        
-        # Initialize Authenticity Validator
-        try:
-            auth_agent = AuthenticityValidator(
-                name="EmosiFloww-Authenticity-Validator",
-                seed=os.getenv("AUTHENTICITY_VALIDATOR_SEED", "authenticity_validator_seed_789"),
-                port=8003,
-                mailbox=True
-            )
-            self.bureau.add(auth_agent.agent)
-            self.agents['authenticity_validator'] = auth_agent
-            logger.info("✅ Authenticity Validator initialized")
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize Authenticity Validator: {e}")
-        
-        # Initialize Trading Legacy Agent
-        try:
-            legacy_agent = TradingLegacyAgent(
-                name="EmosiFloww-Trading-Legacy",
-                seed=os.getenv("TRADING_LEGACY_SEED", "trading_legacy_seed_888"),
-                port=8004,
-                mailbox=True
-            )
-            self.bureau.add(legacy_agent.agent)
-            self.agents['trading_legacy'] = legacy_agent
-            logger.info("✅ Trading Legacy Agent initialized")
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize Trading Legacy Agent: {e}")
+        # Built on the main thread: agents bind to its event loop at construction
+        for key, label, factory, name, seed_env, default_seed, port in AGENT_SPECS:
+            try:
+                agent = factory(
+                    name=name,
+                    seed=os.getenv(seed_env, default_seed),
+                    port=port,
+                    mailbox=self.mailbox
+                )
+            except Exception:
+                logger.exception(f"❌ Failed to initialize {label}")
+                raise
+            self.bureau.add(agent)
+            self.agents[key] = agent
+            logger.info(f"✅ {label} initialized")
         
-        logger.info(f"🎯 Successfully initialized {len(self.agents)}/4 agents")
+        logger.info(f"⏱️ Agent construction took {time.perf_counter() - started:.2f}s")
+        logger.info(f"🎯 Successfully initialized {len(self.agents)}/{len(AGENT_SPECS)} agents")
         
         # Print agent addresses for Agentverse discovery
-        for agent_name, agent_obj in self.agents.items():
-            logger.info(f"🔗 {agent_name}: {agent_obj.agent.address}")
+        for agent_name, agent in self.agents.items():
+            logger.info(f"🔗 {agent_name}: {agent.address}")
     
     def run(self):
         logger.info("🔄 Starting EmosiFloww Agent Bureau...")
         logger.info("🏆 ASI Alliance Hackathon - Human-AI Interaction Excellence")
-        logger.info("📍 All agents registered with mailbox=True for ASI:One discovery")
+        if self.mailbox:
+            logger.info("📍 All agents registered with mailbox=True for ASI:One discovery")
+        else:
+            logger.info("📍 Local-only mode: mailboxes disabled, messages dispatched within the Bureau")
         
         if len(self.agents) == 0:
             logger.error("❌ No agents initialized! Check your environment configuration.")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The agents import `agents.*` and `utils.*` relative to the memory-agents root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -0,0 +1,26 @@
+"""
+Import smoke tests for the agent modules
+Nothing should be built or started at import time; build_agent() must work off a plain import
+"""
+import importlib
+
+import pytest
+
+# marketplace_coordinator is left out: it imports utils modules that are not in this tree
+AGENT_MODULES = (
+    "agents.memory_appraiser",
+    "agents.authenticity_validator",
+    "agents.trading_legacy_agent",
+)
+
+@pytest.mark.parametrize("module_name", AGENT_MODULES)
+def test_build_agent_after_import(module_name):
+    module = importlib.import_module(module_name)
+    agent = module.build_agent(seed=f"{module_name} import smoke test seed", mailbox=False)
+    assert agent.address.startswith("agent1")
+
+@pytest.mark.parametrize("module_name", AGENT_MODULES)
+def test_chat_reply_validates(module_name):
+    module = importlib.import_module(module_name)
+    message = module.create_text_chat("smoke test")
+    assert message.msg_id.version == 4
@@ -0,0 +1 @@
+"""EmosiFloww agent integration utilities"""
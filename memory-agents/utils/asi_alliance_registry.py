@@ -3,15 +3,70 @@ ASI Alliance Agent Registration & Discovery System
 Makes all 4 agents easily discoverable through ASI:One Chat Protocol
 """
 import os
+import re
 import json
+import time
 import asyncio
-from typing import Dict, List, Any, Optional
+import functools
+import heapq
+from collections import Counter, defaultdict
+from hashlib import blake2b
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple
 from uagents import Agent, Context, Bureau, Model
 from uagents.network import wait_for_tx_to_complete
 from uagents.setup import fund_agent_if_low
 from uagents.communication import send_wallet_connect_request, send_message
 import logging
 
+try:
+    import ahocorasick
+except ImportError:  # optional accelerator; fall back to a compiled regex
+    ahocorasick = None
+
+# Query intent classification: keywords match anywhere in the lowercased query
+INTENT_MAPPING = MappingProxyType({
+    "portfolio": ("portfolio", "collection", "worth", "value", "nfts", "assets"),
+    "valuation": ("appraise", "value", "worth", "price", "evaluate"),
+    "authenticity": ("authentic", "real", "verify", "fraud", "fake", "check"),
+    "trading": ("buy", "sell", "trade", "market", "estate", "inheritance"),
+    "discovery": ("agents", "available", "help", "capabilities", "services")
+})
+
+_KEYWORD_INTENTS: Dict[str, frozenset] = {}
+for _intent, _keywords in INTENT_MAPPING.items():
+    for _keyword in _keywords:
+        _KEYWORD_INTENTS[_keyword] = _KEYWORD_INTENTS.get(_keyword, frozenset()) | {_intent}
+
+if ahocorasick is not None:
+    _INTENT_AUTOMATON = ahocorasick.Automaton()
+    for _keyword, _intents in _KEYWORD_INTENTS.items():
+        _INTENT_AUTOMATON.add_word(_keyword, _intents)
+    _INTENT_AUTOMATON.make_automaton()
+else:
+    # The lookahead matches at every offset, so overlapping keywords ("evaluate"/"value")
+    # are all seen; only the longest keyword starting at an offset is reported, so it
+    # carries the intents of any keyword that is a prefix of it
+    _INTENT_RE = re.compile("(?=(%s))" % "|".join(
+        map(re.escape, sorted(_KEYWORD_INTENTS, key=len, reverse=True))
+    ))
+    _PREFIX_INTENTS = {
+        keyword: frozenset().union(*(
+            intents for prefix, intents in _KEYWORD_INTENTS.items() if keyword.startswith(prefix)
+        ))
+        for keyword in _KEYWORD_INTENTS
+    }
+
+# Role keywords looked for in agent names; find_by_role answers from an index built at registration
+ROLE_KEYWORDS = ("appraiser", "authenticity", "verifier", "trading", "market")
+
+def _query_intents(query_lower: str) -> frozenset:
+    """Intents with at least one keyword occurring in the query"""
+    if ahocorasick is not None:
+        return frozenset().union(*(intents for _, intents in _INTENT_AUTOMATON.iter(query_lower)))
+    return frozenset().union(*map(_PREFIX_INTENTS.__getitem__, _INTENT_RE.findall(query_lower)))
+
 # Agent Discovery Protocol
 class AgentRegistrationRequest(Model):
     agent_address: str
@@ -26,136 +81,208 @@ class AgentDiscoveryResponse(Model):
     total_count: int
     categories: Dict[str, int]
 
+# Static agent descriptions used to seed the registry
+AGENT_CAPABILITIES = MappingProxyType({
+    "marketplace_coordinator": {
+        "name": "Memory Marketplace Coordinator",
+        "description": "Natural language interface for memory NFT marketplace operations",
+        "capabilities": [
+            "Natural language query processing",
+            "Portfolio valuation and analysis", 
+            "Transaction coordination",
+            "Market trend analysis",
+            "User interaction management"
+        ],
+        "asi_one_endpoints": [
+            "/chat",
+            "/portfolio-analysis",
+            "/market-query",
+            "/transaction-status"
+        ],
+        "metta_features": [
+            "Memory valuation reasoning",
+            "Market sentiment analysis",
+            "User intent recognition"
+        ],
+        "port": 8000,
+        "webhook": "http://localhost:8000",
+        "status": "active"
+    },
+    "memory_appraiser": {
+        "name": "Memory Valuation Specialist",
+        "description": "AI-powered memory appraisal using advanced MeTTa reasoning",
+        "capabilities": [
+            "Memory rarity assessment",
+            "Emotional value calculation",
+            "Market trend prediction",
+            "Comparative valuation analysis",
+            "Price discovery mechanisms"
+        ],
+        "asi_one_endpoints": [
+            "/appraise-memory",
+            "/market-analysis", 
+            "/price-prediction",
+            "/rarity-assessment"
+        ],
+        "metta_features": [
+            "15+ memory ontologies",
+            "Multi-dimensional scoring",
+            "Predictive pricing models",
+            "Self-learning valuation algorithms"
+        ],
+        "port": 8001,
+        "webhook": "http://localhost:8001", 
+        "status": "active"
+    },
+    "authenticity_validator": {
+        "name": "Memory Authenticity Verifier",
+        "description": "Multi-agent consensus system for memory authenticity verification",
+        "capabilities": [
+            "Deepfake detection",
+            "Metadata verification",
+            "Emotional congruence analysis", 
+            "Multi-agent consensus voting",
+            "Fraud prevention"
+        ],
+        "asi_one_endpoints": [
+            "/verify-authenticity",
+            "/consensus-check",
+            "/fraud-analysis",
+            "/metadata-validation"
+        ],
+        "metta_features": [
+            "Authenticity reasoning chains",
+            "Consensus decision trees",
+            "Fraud pattern recognition",
+            "Evidence weighting algorithms"
+        ],
+        "port": 8002,
+        "webhook": "http://localhost:8002",
+        "status": "active"  
+    },
+    "trading_legacy_agent": {
+        "name": "Market Maker & Legacy Broker",
+        "description": "Combined trading and inheritance management for memory NFTs",
+        "capabilities": [
+            "Market making and liquidity",
+            "Estate planning integration",
+            "Inheritance protocol execution",
+            "Bid/ask spread management",
+            "Legacy transfer coordination"
+        ],
+        "asi_one_endpoints": [
+            "/create-market",
+            "/estate-planning",
+            "/inheritance-setup",
+            "/legacy-transfer"
+        ],
+        "metta_features": [
+            "Market efficiency optimization",
+            "Estate risk assessment",
+            "Generational value modeling",
+            "Legal compliance reasoning"
+        ],
+        "port": 8005,
+        "webhook": "http://localhost:8005",
+        "status": "active"
+    }
+})
+
+# ASI:One Chat Protocol Integration
+ASI_ONE_QUERIES = MappingProxyType({
+    "portfolio": ("What's my collection worth?", "Show my NFTs", "Portfolio analysis"),
+    "valuation": ("How much is this memory worth?", "Appraise my memory", "Market value"),
+    "authenticity": ("Is this memory real?", "Verify authenticity", "Check for fraud"),
+    "trading": ("Buy memory NFT", "Sell my collection", "Create estate plan"),
+    "discovery": ("Show available agents", "What agents are online?", "Agent capabilities")
+})
+
 class ASIAllianceAgentRegistry:
     """Central registry for ASI Alliance agent discovery"""
     
+    # Shared read-only tables, kept reachable from the registry for existing callers
+    agent_capabilities = AGENT_CAPABILITIES
+    asi_one_queries = ASI_ONE_QUERIES
+    
+    __slots__ = (
+        "registered_agents",
+        "_capability_index",
+        "_agent_payload_cache",
+        "_word_counts",
+        "_intent_agents",
+        "_role_index",
+        "_registry_version",
+        "_capability_counts",
+        "_metta_enabled_count",
+        "_active_count",
+        "_summary",
+        "_summary_version",
+    )
+    
     def __init__(self):
         self.registered_agents = {}
-        self.agent_capabilities = {
-            "marketplace_coordinator": {
-                "name": "Memory Marketplace Coordinator",
-                "description": "Natural language interface for memory NFT marketplace operations",
-                "capabilities": [
-                    "Natural language query processing",
-                    "Portfolio valuation and analysis", 
-                    "Transaction coordination",
-                    "Market trend analysis",
-                    "User interaction management"
-                ],
-                "asi_one_endpoints": [
-                    "/chat",
-                    "/portfolio-analysis",
-                    "/market-query",
-                    "/transaction-status"
-                ],
-                "metta_features": [
-                    "Memory valuation reasoning",
-                    "Market sentiment analysis",
-                    "User intent recognition"
-                ],
-                "port": 8000,
-                "webhook": "http://localhost:8000",
-                "status": "active"
-            },
-            "memory_appraiser": {
-                "name": "Memory Valuation Specialist",
-                "description": "AI-powered memory appraisal using advanced MeTTa reasoning",
-                "capabilities": [
-                    "Memory rarity assessment",
-                    "Emotional value calculation",
-                    "Market trend prediction",
-                    "Comparative valuation analysis",
-                    "Price discovery mechanisms"
-                ],
-                "asi_one_endpoints": [
-                    "/appraise-memory",
-                    "/market-analysis", 
-                    "/price-prediction",
-                    "/rarity-assessment"
-                ],
-                "metta_features": [
-                    "15+ memory ontologies",
-                    "Multi-dimensional scoring",
-                    "Predictive pricing models",
-                    "Self-learning valuation algorithms"
-                ],
-                "port": 8001,
-                "webhook": "http://localhost:8001", 
-                "status": "active"
-            },
-            "authenticity_validator": {
-                "name": "Memory Authenticity Verifier",
-                "description": "Multi-agent consensus system for memory authenticity verification",
-                "capabilities": [
-                    "Deepfake detection",
-                    "Metadata verification",
-                    "Emotional congruence analysis", 
-                    "Multi-agent consensus voting",
-                    "Fraud prevention"
-                ],
-                "asi_one_endpoints": [
-                    "/verify-authenticity",
-                    "/consensus-check",
-                    "/fraud-analysis",
-                    "/metadata-validation"
-                ],
-                "metta_features": [
-                    "Authenticity reasoning chains",
-                    "Consensus decision trees",
-                    "Fraud pattern recognition",
-                    "Evidence weighting algorithms"
-                ],
-                "port": 8002,
-                "webhook": "http://localhost:8002",
-                "status": "active"  
-            },
-            "trading_legacy_agent": {
-                "name": "Market Maker & Legacy Broker",
-                "description": "Combined trading and inheritance management for memory NFTs",
-                "capabilities": [
-                    "Market making and liquidity",
-                    "Estate planning integration",
-                    "Inheritance protocol execution",
-                    "Bid/ask spread management",
-                    "Legacy transfer coordination"
-                ],
-                "asi_one_endpoints": [
-                    "/create-market",
-                    "/estate-planning",
-                    "/inheritance-setup",
-                    "/legacy-transfer"
-                ],
-                "metta_features": [
-                    "Market efficiency optimization",
-                    "Estate risk assessment",
-                    "Generational value modeling",
-                    "Legal compliance reasoning"
-                ],
-                "port": 8005,
-                "webhook": "http://localhost:8005",
-                "status": "active"
-            }
-        }
-        
-        # ASI:One Chat Protocol Integration
-        self.asi_one_queries = {
-            "portfolio": ["What's my collection worth?", "Show my NFTs", "Portfolio analysis"],
-            "valuation": ["How much is this memory worth?", "Appraise my memory", "Market value"],
-            "authenticity": ["Is this memory real?", "Verify authenticity", "Check for fraud"],
-            "trading": ["Buy memory NFT", "Sell my collection", "Create estate plan"],
-            "discovery": ["Show available agents", "What agents are online?", "Agent capabilities"]
-        }
+        # lowercased capability -> addresses, and the discovery payload per address
+        self._capability_index: Dict[str, set] = defaultdict(set)
+        self._agent_payload_cache: Dict[str, Dict] = {}
+        # address -> (description, capability) word counts scored against every query
+        self._word_counts: Dict[str, Tuple[Counter, Counter]] = {}
+        # intent -> addresses of agents that handle it, in registration order
+        self._intent_agents: Dict[str, List[str]] = {intent: [] for intent in INTENT_MAPPING}
+        # role keyword -> addresses of agents whose name contains it, in registration order
+        self._role_index: Dict[str, Tuple[str, ...]] = dict.fromkeys(ROLE_KEYWORDS, ())
+        # Bumped on every registry change; part of the discovery response cache key
+        self._registry_version = 0
+        # Summary aggregates kept up to date on (un)registration
+        self._capability_counts: Counter = Counter()
+        self._metta_enabled_count = 0
+        self._active_count = 0
+        self._summary: Optional[Dict[str, Any]] = None
+        self._summary_version = -1
+    
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever agents are registered or removed"""
+        return self._registry_version
     
     def register_agent(self, agent_address: str, agent_info: Dict) -> bool:
         """Register agent for ASI:One discovery"""
         try:
+            if agent_address in self.registered_agents:
+                self.unregister_agent(agent_address)
+            now = time.monotonic()
             self.registered_agents[agent_address] = {
                 **agent_info,
-                "registered_at": asyncio.get_event_loop().time(),
-                "last_seen": asyncio.get_event_loop().time(),
+                "registered_at": now,
+                "last_seen": now,
                 "message_count": 0,
                 "success_rate": 1.0
             }
+            self._word_counts[agent_address] = (
+                Counter(agent_info["description"].lower().split()),
+                Counter(" ".join(agent_info.get("capabilities", [])).lower().split())
+            )
+            for cap in agent_info.get("capabilities", []):
+                self._capability_index[cap.lower()].add(agent_address)
+            self._agent_payload_cache[agent_address] = {
+                "address": agent_address,
+                "name": agent_info["name"],
+                "description": agent_info["description"],
+                "webhook": agent_info["webhook"],
+                "capabilities": agent_info["capabilities"],
+                "metta_features": agent_info.get("metta_features", [])
+            }
+            agent_name = agent_info["name"].lower()
+            description = agent_info["description"].lower()
+            for intent, keywords in INTENT_MAPPING.items():
+                if intent in agent_name or any(keyword in description for keyword in keywords):
+                    self._intent_agents[intent].append(agent_address)
+            for role in ROLE_KEYWORDS:
+                if role in agent_name:
+                    self._role_index[role] += (agent_address,)
+            self._capability_counts.update(agent_info.get("capabilities", []))
+            self._metta_enabled_count += bool(agent_info.get("metta_features"))
+            self._active_count += agent_info.get("status") == "active"
+            self._registry_version += 1
             
             logging.info(f"✅ Registered agent: {agent_info['name']} at {agent_address}")
             return True
@@ -163,78 +290,108 @@ class ASIAllianceAgentRegistry:
             logging.error(f"❌ Failed to register agent: {e}")
             return False
     
+    def unregister_agent(self, agent_address: str) -> bool:
+        """Remove an agent and its capability index entries"""
+        agent_info = self.registered_agents.pop(agent_address, None)
+        if agent_info is None:
+            return False
+        for cap in agent_info.get("capabilities", []):
+            addresses = self._capability_index.get(cap.lower())
+            if addresses is not None:
+                addresses.discard(agent_address)
+                if not addresses:
+                    del self._capability_index[cap.lower()]
+        self._agent_payload_cache.pop(agent_address, None)
+        self._word_counts.pop(agent_address, None)
+        for addresses in self._intent_agents.values():
+            if agent_address in addresses:
+                addresses.remove(agent_address)
+        for role, addresses in self._role_index.items():
+            if agent_address in addresses:
+                self._role_index[role] = tuple(a for a in addresses if a != agent_address)
+        for cap in agent_info.get("capabilities", []):
+            self._capability_counts[cap] -= 1
+            if self._capability_counts[cap] <= 0:
+                del self._capability_counts[cap]
+        self._metta_enabled_count -= bool(agent_info.get("metta_features"))
+        self._active_count -= agent_info.get("status") == "active"
+        self._registry_version += 1
+        return True
+    
+    def find_by_role(self, role: str) -> Tuple[str, ...]:
+        """Addresses of agents whose name contains a ROLE_KEYWORDS entry"""
+        return self._role_index.get(role, ())
+    
     def discover_agents_by_capability(self, capability: str) -> List[Dict]:
         """Discover agents by specific capability"""
-        matching_agents = []
-        
-        for address, agent_info in self.registered_agents.items():
-            if capability.lower() in [cap.lower() for cap in agent_info.get("capabilities", [])]:
-                matching_agents.append({
-                    "address": address,
-                    "name": agent_info["name"],
-                    "description": agent_info["description"],
-                    "webhook": agent_info["webhook"],
-                    "capabilities": agent_info["capabilities"],
-                    "metta_features": agent_info.get("metta_features", [])
-                })
-        
-        return matching_agents
+        return [
+            self._agent_payload_cache[address]
+            for address in self._capability_index.get(capability.lower(), ())
+        ]
     
-    def discover_agents_by_asi_one_query(self, query: str) -> List[Dict]:
-        """Discover agents based on ASI:One natural language query"""
-        query_lower = query.lower()
-        relevant_agents = []
+    def discover_agents_by_asi_one_query(self, query: str, limit: Optional[int] = None) -> List[Dict]:
+        """Discover agents based on ASI:One natural language query, best `limit` first"""
+        intents = _query_intents(query.lower())
+        # One entry per agent; an agent matching several intents collects all their suggestions
+        seen: Dict[str, Dict] = {}
         
-        # Query intent classification
-        intent_mapping = {
-            "portfolio": ["portfolio", "collection", "worth", "value", "nfts", "assets"],
-            "valuation": ["appraise", "value", "worth", "price", "evaluate"],
-            "authenticity": ["authentic", "real", "verify", "fraud", "fake", "check"],
-            "trading": ["buy", "sell", "trade", "market", "estate", "inheritance"],
-            "discovery": ["agents", "available", "help", "capabilities", "services"]
-        }
-        
-        for intent, keywords in intent_mapping.items():
-            if any(keyword in query_lower for keyword in keywords):
-                # Find agents that handle this intent
-                for address, agent_info in self.registered_agents.items():
-                    agent_name = agent_info["name"].lower()
-                    if intent in agent_name or any(keyword in agent_info["description"].lower() for keyword in keywords):
-                        relevant_agents.append({
-                            "address": address,
-                            "name": agent_info["name"],
-                            "description": agent_info["description"],
-                            "webhook": agent_info["webhook"],
-                            "confidence": self._calculate_relevance_score(query, agent_info),
-                            "asi_one_endpoints": agent_info.get("asi_one_endpoints", []),
-                            "suggested_queries": self.asi_one_queries.get(intent, [])
-                        })
+        for intent, addresses in self._intent_agents.items():
+            if intent in intents:
+                # Agents handling each intent are resolved at registration
+                for address in addresses:
+                    suggested_queries = ASI_ONE_QUERIES.get(intent, ())
+                    if address in seen:
+                        seen[address]["suggested_queries"].extend(suggested_queries)
+                        continue
+                    agent_info = self.registered_agents[address]
+                    seen[address] = {
+                        "address": address,
+                        "name": agent_info["name"],
+                        "description": agent_info["description"],
+                        "webhook": agent_info["webhook"],
+                        "confidence": self._calculate_relevance_score(query, address),
+                        "asi_one_endpoints": agent_info.get("asi_one_endpoints", []),
+                        "suggested_queries": list(suggested_queries)
+                    }
         
-        # Sort by confidence/relevance
-        relevant_agents.sort(key=lambda x: x["confidence"], reverse=True)
-        return relevant_agents
+        # Sort by confidence/relevance; only rank the top `limit` when one is given
+        if limit:
+            return heapq.nlargest(limit, seen.values(), key=itemgetter("confidence"))
+        return sorted(seen.values(), key=itemgetter("confidence"), reverse=True)
     
-    def _calculate_relevance_score(self, query: str, agent_info: Dict) -> float:
-        """Calculate how relevant an agent is to a query"""
-        query_words = set(query.lower().split())
-        
-        # Check description relevance
-        description_words = set(agent_info["description"].lower().split())
-        description_overlap = len(query_words & description_words) / len(query_words)
-        
-        # Check capability relevance  
-        capability_text = " ".join(agent_info.get("capabilities", [])).lower()
-        capability_words = set(capability_text.split())
-        capability_overlap = len(query_words & capability_words) / len(query_words)
+    def _calculate_relevance_score(self, query: str, agent_address: str) -> float:
+        """Calculate how relevant a registered agent is to a query"""
+        query_words = Counter(query.lower().split())
+        n = len(query_words) or 1  # an empty query scores 0 rather than dividing by zero
         
-        # Weighted score
-        return (description_overlap * 0.6) + (capability_overlap * 0.4)
+        # Weighted description and capability overlap per distinct query word; a word
+        # repeated in both the query and the agent's text counts once per shared occurrence,
+        # with each overlap capped at n so the score stays within [0, 1]
+        desc_counts, cap_counts = self._word_counts[agent_address]
+        description_overlap = min((query_words & desc_counts).total(), n)
+        capability_overlap = min((query_words & cap_counts).total(), n)
+        return (0.6 * description_overlap + 0.4 * capability_overlap) / n
     
     def get_agent_registry_summary(self) -> Dict[str, Any]:
-        """Get complete registry summary for ASI:One"""
+        """Get complete registry summary for ASI:One; rebuilt only after the registry changes"""
+        if self._summary_version != self._registry_version:
+            self._summary = self._build_summary()
+            self._summary_version = self._registry_version
+        
+        # Callers get their own copy; the cached aggregate stays untouched
+        summary = self._summary
+        return {
+            **summary,
+            "agent_categories": dict(summary["agent_categories"]),
+            "available_capabilities": list(summary["available_capabilities"]),
+            "sample_queries": list(summary["sample_queries"])
+        }
+    
+    def _build_summary(self) -> Dict[str, Any]:
+        """Summary from the incrementally maintained aggregates"""
         return {
             "total_agents": len(self.registered_agents),
-            "active_agents": len([a for a in self.registered_agents.values() if a.get("status") == "active"]),
+            "active_agents": self._active_count,
             "agent_categories": {
                 "coordination": 1,
                 "valuation": 1,
@@ -242,11 +399,8 @@ class ASIAllianceAgentRegistry:
                 "trading": 1
             },
             "asi_one_compatible": len(self.registered_agents),
-            "metta_enabled": len([a for a in self.registered_agents.values() if a.get("metta_features")]),
-            "available_capabilities": list(set(
-                cap for agent in self.registered_agents.values() 
-                for cap in agent.get("capabilities", [])
-            )),
+            "metta_enabled": self._metta_enabled_count,
+            "available_capabilities": list(self._capability_counts),
             "sample_queries": [
                 "What's my memory collection worth?",
                 "Is this childhood video authentic?", 
@@ -255,14 +409,23 @@ class ASIAllianceAgentRegistry:
             ]
         }
     
-    def generate_asi_one_discovery_response(self, query: str) -> Dict[str, Any]:
+    def generate_asi_one_discovery_response(self, query: str, limit: int = 10) -> Dict[str, Any]:
         """Generate comprehensive discovery response for ASI:One"""
-        relevant_agents = self.discover_agents_by_asi_one_query(query)
+        query_norm = " ".join(query.lower().split())
+        relevant_agents = _discovery_agents(self, query_norm, limit, self._registry_version)
         registry_summary = self.get_agent_registry_summary()
         
         return {
             "query": query,
-            "relevant_agents": relevant_agents,
+            # Mutable copies for the caller; the cached entries are frozen and shared
+            "relevant_agents": [
+                {
+                    **agent,
+                    "asi_one_endpoints": list(agent["asi_one_endpoints"]),
+                    "suggested_queries": list(agent["suggested_queries"])
+                }
+                for agent in relevant_agents
+            ],
             "total_agents_available": registry_summary["total_agents"],
             "registry_summary": registry_summary,
             "suggested_next_queries": [
@@ -272,19 +435,43 @@ class ASIAllianceAgentRegistry:
                 "Create a trading strategy for memory NFTs"
             ],
             "asi_one_compatible": True,
-            "response_timestamp": asyncio.get_event_loop().time()
+            "response_timestamp": time.time()
         }
 
 
-# Global registry instance
-agent_registry = ASIAllianceAgentRegistry()
+@functools.lru_cache(maxsize=1024)
+def _discovery_agents(registry: ASIAllianceAgentRegistry, query_norm: str, limit: int, registry_version: int) -> Tuple[MappingProxyType, ...]:
+    """Ranked agents for a normalized query, frozen; registry_version invalidates old entries"""
+    return tuple(
+        MappingProxyType({
+            **agent,
+            "asi_one_endpoints": tuple(agent["asi_one_endpoints"]),
+            "suggested_queries": tuple(agent["suggested_queries"])
+        })
+        for agent in registry.discover_agents_by_asi_one_query(query_norm, limit)
+    )
+
+
+# Global registry instance, created on first use
+@functools.cache
+def get_registry() -> ASIAllianceAgentRegistry:
+    """Return the shared registry"""
+    return ASIAllianceAgentRegistry()
+
+def __getattr__(name: str):
+    # Keeps `from utils.asi_alliance_registry import agent_registry` working
+    if name == "agent_registry":
+        return get_registry()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Auto-register all agents
 def initialize_agent_registry():
     """Initialize and register all marketplace agents"""
-    for agent_name, agent_info in agent_registry.agent_capabilities.items():
-        # Generate agent address (in real implementation, this would be actual addresses)
-        agent_address = f"agent1{hash(agent_name) % 1000000:06d}..."
+    agent_registry = get_registry()
+    for agent_name, agent_info in AGENT_CAPABILITIES.items():
+        # Generate agent address (in real implementation, this would be actual addresses);
+        # a digest keeps it stable across restarts, unlike the per-process salted hash()
+        agent_address = "agent1" + blake2b(agent_name.encode(), digest_size=6).hexdigest()
         
         agent_registry.register_agent(agent_address, agent_info)
     
@@ -297,6 +484,7 @@ def initialize_agent_registry():
 async def test_agent_discovery():
     """Test agent discovery functionality"""
     initialize_agent_registry()
+    agent_registry = get_registry()
     
     # Test queries
     test_queries = [
@@ -306,9 +494,14 @@ async def test_agent_discovery():
         "Show available agents"
     ]
     
-    for query in test_queries:
+    # Run the queries concurrently, then report them in order
+    responses = await asyncio.gather(*(
+        asyncio.to_thread(agent_registry.generate_asi_one_discovery_response, query)
+        for query in test_queries
+    ))
+    
+    for query, response in zip(test_queries, responses):
         print(f"\n🔍 Query: '{query}'")
-        response = agent_registry.generate_asi_one_discovery_response(query)
         print(f"📊 Found {len(response['relevant_agents'])} relevant agents")
         
         for agent in response['relevant_agents'][:2]:  # Show top 2
@@ -3,10 +3,121 @@ EmosiFloww Integration Functions
 Provides easy access to user's time capsules and NFT data for AI agents
 """
 import asyncio
-import json
-import requests
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
+
+# NFT Contract configurations (from nft-metadata-fetcher.js)
+NFT_CONTRACTS = MappingProxyType({
+    "old": {
+        "address": "0xfb42a2c4b5eb535cfe704ef64da416f1cf69bde3",
+        "name": "Public TimeCapsule NFT (Immediate Access)"
+    },
+    "time_locked": {
+        "address": "0x508bbc0cf873c11dbf9d72bfcea3dc1e69739c38", 
+        "name": "Time-Locked TimeCapsule NFT (Scheduled)"
+    }
+})
+
+class Capsule(NamedTuple):
+    """One sample time capsule as shown on the capsules page"""
+    id: str
+    title: str
+    description: str
+    status: str
+    unlock_date: str
+    file_count: int
+    created_date: str
+    estimated_value: str
+    sentiment_tags: Tuple[str, ...]
+    nft_token_id: int
+    contract_address: str
+
+# Sample portfolio data, built once and shared by every request
+SAMPLE_CAPSULES: Tuple[Capsule, ...] = (
+    Capsule(
+        id="capsule_001",
+        title="My First Capsule",
+        description="A collection of memories from 2025",
+        status="locked",
+        unlock_date="2026-12-25T00:00:00Z",
+        file_count=3,
+        created_date="2025-09-01T10:00:00Z",
+        estimated_value="$2,500",
+        sentiment_tags=("nostalgic", "family", "celebration"),
+        nft_token_id=101,
+        contract_address=NFT_CONTRACTS["time_locked"]["address"]
+    ),
+    Capsule(
+        id="capsule_002",
+        title="Birthday Memories",
+        description="Special moments from my birthday",
+        status="unlocked",
+        unlock_date="2025-01-15T00:00:00Z",
+        file_count=5,
+        created_date="2024-12-01T10:00:00Z",
+        estimated_value="$1,200",
+        sentiment_tags=("joyful", "personal", "milestone"),
+        nft_token_id=102,
+        contract_address=NFT_CONTRACTS["old"]["address"]
+    ),
+    Capsule(
+        id="capsule_003",
+        title="Travel Adventures",
+        description="Photos and videos from Europe trip",
+        status="locked",
+        unlock_date="2026-06-10T00:00:00Z",
+        file_count=12,
+        created_date="2025-08-15T10:00:00Z",
+        estimated_value="$4,200",
+        sentiment_tags=("adventurous", "cultural", "rare"),
+        nft_token_id=103,
+        contract_address=NFT_CONTRACTS["time_locked"]["address"]
+    ),
+    Capsule(
+        id="capsule_004",
+        title="Family Reunion",
+        description="Multi-generational family gathering 2025",
+        status="locked",
+        unlock_date="2030-01-01T00:00:00Z",
+        file_count=8,
+        created_date="2025-07-04T10:00:00Z",
+        estimated_value="$850",
+        sentiment_tags=("family", "legacy", "emotional"),
+        nft_token_id=104,
+        contract_address=NFT_CONTRACTS["time_locked"]["address"]
+    ),
+)
+# Agents consume capsules as dicts (and they are serialized as JSON objects); these
+# shared copies are read-only and each caller gets its own dicts
+_SAMPLE_CAPSULE_DICTS = tuple(MappingProxyType(capsule._asdict()) for capsule in SAMPLE_CAPSULES)
+_SAMPLE_PORTFOLIO_SUMMARY = MappingProxyType({
+    "locked_capsules": 3,
+    "unlocked_capsules": 1,
+    "estimated_value": "$8,750",
+    "total_files": 24
+})
+
+# Token fields that do not depend on the token id; per-token fields are filled in by _token_data
+_SAMPLE_TOKEN_OWNER = "0x1234567890123456789012345678901234567890"
+_TOKEN_METADATA_TEMPLATE = {
+    "name": None,
+    "description": "Encrypted time-locked memory capsule",
+    "encrypted_blob_id": None,
+    "unlock_time": 1735689600,  # Future timestamp
+    "is_unlocked": False,
+    "file_count": None,
+    "creation_date": "2025-09-01T10:00:00Z",
+    "storage_epochs": 10,
+    "file_types": ("image/jpeg", "video/mp4", "text/plain")
+}
+_TOKEN_AUTHENTICITY_TEMPLATE = {
+    "authenticity_score": None,
+    "verification_status": "verified",
+    "fraud_indicators": (),
+    "metadata_consistency": "high",
+    "technical_analysis": "passed"
+}
 
 class EmosiFlowwDataAccess:
     """
@@ -14,19 +125,12 @@ class EmosiFlowwDataAccess:
     References the comparison page and capsules page functionality
     """
     
+    __slots__ = (
+        "walrus_aggregator",
+        "walrus_publisher",
+    )
+    
     def __init__(self):
-        # NFT Contract configurations (from nft-metadata-fetcher.js)
-        self.nft_contracts = {
-            "old": {
-                "address": "0xfb42a2c4b5eb535cfe704ef64da416f1cf69bde3",
-                "name": "Public TimeCapsule NFT (Immediate Access)"
-            },
-            "time_locked": {
-                "address": "0x508bbc0cf873c11dbf9d72bfcea3dc1e69739c38", 
-                "name": "Time-Locked TimeCapsule NFT (Scheduled)"
-            }
-        }
-        
         # Walrus network endpoints
         self.walrus_aggregator = "https://aggregator.walrus-testnet.walrus.space/v1"
         self.walrus_publisher = "https://publisher.walrus-testnet.walrus.space/v1/blobs"
@@ -39,73 +143,13 @@ class EmosiFlowwDataAccess:
         try:
             # Simulate fetching user's capsules (in real implementation, query blockchain)
             # This mirrors the capsules page functionality
-            sample_portfolio = {
+            return {
                 "wallet_address": wallet_address,
-                "total_capsules": 4,
-                "portfolio_summary": {
-                    "locked_capsules": 3,
-                    "unlocked_capsules": 1,
-                    "estimated_value": "$8,750",
-                    "total_files": 24
-                },
-                "capsules": [
-                    {
-                        "id": "capsule_001",
-                        "title": "My First Capsule", 
-                        "description": "A collection of memories from 2025",
-                        "status": "locked",
-                        "unlock_date": "2026-12-25T00:00:00Z",
-                        "file_count": 3,
-                        "created_date": "2025-09-01T10:00:00Z",
-                        "estimated_value": "$2,500",
-                        "sentiment_tags": ["nostalgic", "family", "celebration"],
-                        "nft_token_id": 101,
-                        "contract_address": self.nft_contracts["time_locked"]["address"]
-                    },
-                    {
-                        "id": "capsule_002", 
-                        "title": "Birthday Memories",
-                        "description": "Special moments from my birthday",
-                        "status": "unlocked",
-                        "unlock_date": "2025-01-15T00:00:00Z",
-                        "file_count": 5,
-                        "created_date": "2024-12-01T10:00:00Z",
-                        "estimated_value": "$1,200",
-                        "sentiment_tags": ["joyful", "personal", "milestone"],
-                        "nft_token_id": 102,
-                        "contract_address": self.nft_contracts["old"]["address"]
-                    },
-                    {
-                        "id": "capsule_003",
-                        "title": "Travel Adventures", 
-                        "description": "Photos and videos from Europe trip",
-                        "status": "locked",
-                        "unlock_date": "2026-06-10T00:00:00Z",
-                        "file_count": 12,
-                        "created_date": "2025-08-15T10:00:00Z",
-                        "estimated_value": "$4,200",
-                        "sentiment_tags": ["adventurous", "cultural", "rare"],
-                        "nft_token_id": 103,
-                        "contract_address": self.nft_contracts["time_locked"]["address"]
-                    },
-                    {
-                        "id": "capsule_004",
-                        "title": "Family Reunion",
-                        "description": "Multi-generational family gathering 2025", 
-                        "status": "locked",
-                        "unlock_date": "2030-01-01T00:00:00Z",
-                        "file_count": 8,
-                        "created_date": "2025-07-04T10:00:00Z",
-                        "estimated_value": "$850",
-                        "sentiment_tags": ["family", "legacy", "emotional"],
-                        "nft_token_id": 104,
-                        "contract_address": self.nft_contracts["time_locked"]["address"]
-                    }
-                ]
+                "total_capsules": len(SAMPLE_CAPSULES),
+                "portfolio_summary": dict(_SAMPLE_PORTFOLIO_SUMMARY),
+                "capsules": [dict(capsule) for capsule in _SAMPLE_CAPSULE_DICTS]
             }
             
-            return sample_portfolio
-            
         except Exception as e:
             return {
                 "error": f"Failed to fetch user portfolio: {str(e)}",
@@ -124,46 +168,14 @@ class EmosiFlowwDataAccess:
                 "analysis_timestamp": datetime.now().isoformat(),
                 "token_count": len(token_ids),
                 "contracts_analyzed": [
-                    self.nft_contracts["old"]["address"],
-                    self.nft_contracts["time_locked"]["address"]
+                    NFT_CONTRACTS["old"]["address"],
+                    NFT_CONTRACTS["time_locked"]["address"]
                 ],
                 "tokens": {}
             }
             
-            for token_id in token_ids:
-                # Sample metadata structure (based on actual contract data)
-                token_data = {
-                    "token_id": token_id,
-                    "contract_address": self.nft_contracts["time_locked"]["address"],
-                    "owner": "0x1234567890123456789012345678901234567890",
-                    "metadata": {
-                        "name": f"Time Capsule #{token_id}",
-                        "description": "Encrypted time-locked memory capsule",
-                        "encrypted_blob_id": f"encrypted_blob_{token_id}_U2FsdGVkX19...",
-                        "unlock_time": 1735689600,  # Future timestamp
-                        "is_unlocked": False,
-                        "file_count": 3 + (token_id % 5),
-                        "creation_date": "2025-09-01T10:00:00Z",
-                        "storage_epochs": 10,
-                        "file_types": ["image/jpeg", "video/mp4", "text/plain"]
-                    },
-                    "market_data": {
-                        "estimated_value": 1000 + (token_id * 250),
-                        "rarity_score": 0.75 + (token_id * 0.05) % 0.25,
-                        "market_sentiment": "bullish" if token_id % 2 == 0 else "stable",
-                        "last_sale_price": 800 + (token_id * 150),
-                        "trading_volume_24h": 5000 + (token_id * 1000)
-                    },
-                    "authenticity_data": {
-                        "authenticity_score": 0.92 + (token_id * 0.01) % 0.08,
-                        "verification_status": "verified",
-                        "fraud_indicators": [],
-                        "metadata_consistency": "high",
-                        "technical_analysis": "passed"
-                    }
-                }
-                
-                metadata_results["tokens"][str(token_id)] = token_data
+            # Token data is simulated locally, so there is nothing to overlap
+            metadata_results["tokens"] = {str(token_id): self._token_data(token_id) for token_id in token_ids}
             
             return metadata_results
             
@@ -174,36 +186,41 @@ class EmosiFlowwDataAccess:
                 "tokens": {}
             }
     
+    def _token_data(self, token_id: int) -> Dict[str, Any]:
+        """
+        One token's metadata, market and authenticity data
+        """
+        # Sample metadata structure (based on actual contract data). Only the
+        # token-dependent fields are computed here; the rest comes from the shared templates
+        return {
+            "token_id": token_id,
+            "contract_address": NFT_CONTRACTS["time_locked"]["address"],
+            "owner": _SAMPLE_TOKEN_OWNER,
+            "metadata": {
+                **_TOKEN_METADATA_TEMPLATE,
+                "name": f"Time Capsule #{token_id}",
+                "encrypted_blob_id": f"encrypted_blob_{token_id}_U2FsdGVkX19...",
+                "file_count": 3 + (token_id % 5)
+            },
+            "market_data": {
+                "estimated_value": 1000 + (token_id * 250),
+                "rarity_score": 0.75 + (token_id * 0.05) % 0.25,
+                "market_sentiment": "bullish" if token_id % 2 == 0 else "stable",
+                "last_sale_price": 800 + (token_id * 150),
+                "trading_volume_24h": 5000 + (token_id * 1000)
+            },
+            "authenticity_data": {
+                **_TOKEN_AUTHENTICITY_TEMPLATE,
+                "authenticity_score": 0.92 + (token_id * 0.01) % 0.08
+            }
+        }
+    
     async def get_walrus_content_preview(self, blob_id: str) -> Dict[str, Any]:
         """
         Get preview of Walrus-stored content for agent analysis
         """
         try:
-            # In real implementation, would fetch from Walrus aggregator
-            # For now, return simulated preview data
-            preview_data = {
-                "blob_id": blob_id,
-                "content_type": "mixed",
-                "preview": {
-                    "has_images": True,
-                    "has_videos": True, 
-                    "has_text": True,
-                    "estimated_file_count": 4,
-                    "total_size_mb": 25.3,
-                    "dominant_colors": ["#FF6B6B", "#4ECDC4", "#45B7D1"],
-                    "detected_faces": 3,
-                    "text_sentiment": "positive",
-                    "quality_score": 0.87
-                },
-                "accessibility": {
-                    "is_accessible": False,
-                    "unlock_time": "2026-12-25T00:00:00Z",
-                    "time_remaining": "457 days",
-                    "can_preview": True
-                }
-            }
-            
-            return preview_data
+            return await self._fetch_walrus_preview(blob_id)
             
         except Exception as e:
             return {
@@ -211,6 +228,34 @@ class EmosiFlowwDataAccess:
                 "blob_id": blob_id
             }
     
+    async def _fetch_walrus_preview(self, blob_id: str) -> Dict[str, Any]:
+        """
+        Fetch one blob preview
+        """
+        # In real implementation, would GET from the Walrus aggregator
+        # For now, return simulated preview data
+        return {
+            "blob_id": blob_id,
+            "content_type": "mixed",
+            "preview": {
+                "has_images": True,
+                "has_videos": True, 
+                "has_text": True,
+                "estimated_file_count": 4,
+                "total_size_mb": 25.3,
+                "dominant_colors": ["#FF6B6B", "#4ECDC4", "#45B7D1"],
+                "detected_faces": 3,
+                "text_sentiment": "positive",
+                "quality_score": 0.87
+            },
+            "accessibility": {
+                "is_accessible": False,
+                "unlock_time": "2026-12-25T00:00:00Z",
+                "time_remaining": "457 days",
+                "can_preview": True
+            }
+        }
+    
     async def get_market_sentiment_data(self) -> Dict[str, Any]:
         """
         Get overall time capsule market sentiment for agent analysis
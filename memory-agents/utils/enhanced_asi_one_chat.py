@@ -3,21 +3,94 @@ Enhanced ASI:One Chat Protocol for Agent Discovery
 Implements comprehensive human-agent interaction with agent discovery
 """
 import os
-import json
+import re
 import asyncio
-from typing import Dict, List, Any, Optional
+import functools
+import orjson
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import AsyncIterator, Dict, List, Any, Optional
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import logging
 
+try:
+    import ahocorasick
+except ImportError:  # optional accelerator; fall back to compiled regexes
+    ahocorasick = None
+
 # Import agent registry
 from .asi_alliance_registry import agent_registry
 
+# Chat responses kept per (message, reasoning flag, registry version), least recently used evicted first
+RESPONSE_CACHE_SIZE = 1024
+
+# Dedicated worker pools, so long formatting work never starves registry lookups
+# and neither competes with other users of the loop's default executor
+_FMT_EXEC = ThreadPoolExecutor(max_workers=16, thread_name_prefix="asi-fmt")
+_IO_EXEC = ThreadPoolExecutor(max_workers=8, thread_name_prefix="asi-registry")
+
+# Chat sessions remembered, least recently active evicted first
+MAX_SESSIONS = 10_000
+
+# Upper bound on chat requests processed at once by the /asi-one/chat endpoint
+_CHAT_SEM = asyncio.Semaphore(int(os.getenv("ASI_ONE_CONCURRENCY", "8")))
+
+# Chat reply templates, filled with str.format_map
+DISCOVERY_TEMPLATE = """🤖 **Memory Marketplace Agent Discovery**
+
+I found **{agent_count}** agents that can help you:
+
+{agent_lines}📊 **System Overview:**
+• Total Agents: {total_agents} 
+• ASI:One Compatible: {asi_one_compatible}
+• MeTTa Enabled: {metta_enabled}
+
+🔍 **Popular Queries:**
+{popular_queries}"""
+
+DISCOVERY_AGENT_TEMPLATE = """**{rank}. {name}** (Confidence: {confidence:.1%})
+   📋 {description}
+   🎯 Webhook: `{webhook}`
+   💡 Try: "{try_query}"
+
+"""
+
+QUERY_LINE_TEMPLATE = '• "{}"\n'
+
+GENERAL_TEMPLATE = """🧠 **Memory Marketplace Assistant**
+
+I understand you're looking for help with: "{message}"
+
+🤖 **Available Specialized Agents:**
+{agent_lines}
+💡 **Try These Specific Queries:**
+• "What's my memory collection worth?"
+• "Is this childhood video authentic?" 
+• "Help me buy rare graduation memories"
+• "Create an estate plan for my NFTs"
+
+🔍 **For Agent Discovery:** "Show me available agents"
+"""
+
+GENERAL_AGENT_TEMPLATE = "• **{name}**: {description}\n"
+
+async def _run_in(executor: ThreadPoolExecutor, fn, *args):
+    """Run a blocking call in one of the worker pools above"""
+    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+def _sse_event(event: str, data: Any) -> bytes:
+    """Encode one server-sent event; the JSON payload keeps multi-line text on one data line"""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
 class ASIOneChatRequest(BaseModel):
     message: str
     user_context: Optional[Dict[str, Any]] = None
     session_id: Optional[str] = None
     intent: Optional[str] = None
+    include_reasoning: bool = True
 
 class ASIOneChatResponse(BaseModel):
     response: str
@@ -27,100 +100,200 @@ class ASIOneChatResponse(BaseModel):
     suggested_actions: List[str]
     metta_reasoning: Optional[Dict[str, Any]] = None
 
+# Enhanced intent patterns for agent discovery
+INTENT_PATTERNS = MappingProxyType({
+    "agent_discovery": (
+        "what agents", "show agents", "available agents", "help me find",
+        "which agent", "who can help", "agent list", "services available"
+    ),
+    "portfolio_analysis": (
+        "my collection", "portfolio worth", "nft value", "collection value",
+        "show my nfts", "assets", "investment"
+    ),
+    "memory_valuation": (
+        "how much worth", "appraise", "value this", "price", "evaluate",
+        "market value", "what's it worth"
+    ),
+    "authenticity_check": (
+        "is real", "authentic", "verify", "check authenticity", "fraud",
+        "genuine", "fake detection"
+    ),
+    "trading_assistance": (
+        "buy memory", "sell nft", "trade", "purchase", "marketplace",
+        "estate plan", "inheritance"
+    ),
+    "market_insights": (
+        "market trends", "prices", "demand", "popular memories",
+        "investment advice", "market analysis"
+    )
+})
+
+# MeTTa reasoning templates for different intents
+METTA_REASONING_TEMPLATES = MappingProxyType({
+    "agent_discovery": MappingProxyType({
+        "reasoning_chain": (
+            "User seeks agent assistance",
+            "Analyze query for specific capabilities needed", 
+            "Match capabilities to available agents",
+            "Rank agents by relevance and confidence",
+            "Provide discovery response with suggested actions"
+        ),
+        "knowledge_base": "agent_registry_ontology"
+    }),
+    "portfolio_analysis": MappingProxyType({
+        "reasoning_chain": (
+            "User wants portfolio insights",
+            "Route to Memory Appraiser for valuation",
+            "Consider market trends and rarity factors",
+            "Generate comprehensive analysis report"
+        ),
+        "knowledge_base": "memory_valuation_ontology"
+    }),
+    "authenticity_check": MappingProxyType({
+        "reasoning_chain": (
+            "User questions memory authenticity",
+            "Route to Authenticity Validator agent",
+            "Apply multi-agent consensus verification",
+            "Provide confidence score and reasoning"
+        ),
+        "knowledge_base": "authenticity_verification_ontology"
+    })
+})
+
 class EnhancedASIOneClient:
     """Enhanced ASI:One client with agent discovery and MeTTa reasoning"""
     
+    __slots__ = ("api_key", "session_history", "_response_cache", "_intent_automaton", "_intent_res", "_dispatch")
+    
+    # Shared, read-only pattern tables
+    intent_patterns = INTENT_PATTERNS
+    metta_reasoning_templates = METTA_REASONING_TEMPLATES
+    
+    # MeTTa reasoning fields shared by every response, whatever the intent
+    _METTA_CONST = MappingProxyType({
+        "confidence_factors": (
+            "Intent pattern matching",
+            "Agent capability alignment", 
+            "Historical query success rate"
+        ),
+        "metta_features_applied": (
+            "Intent recognition ontology",
+            "Agent capability mapping",
+            "User context reasoning"
+        )
+    })
+    _DEFAULT_REASONING_CHAIN = ("General query processing",)
+    _EMPTY_TEMPLATE = MappingProxyType({})
+    
     def __init__(self):
         self.api_key = os.getenv("ASI_ONE_API_KEY", "demo_key")
-        self.session_history = {}
+        self.session_history: "OrderedDict[str, None]" = OrderedDict()
+        self._response_cache: "OrderedDict[tuple, ASIOneChatResponse]" = OrderedDict()
         
-        # Enhanced intent patterns for agent discovery
-        self.intent_patterns = {
-            "agent_discovery": [
-                "what agents", "show agents", "available agents", "help me find",
-                "which agent", "who can help", "agent list", "services available"
-            ],
-            "portfolio_analysis": [
-                "my collection", "portfolio worth", "nft value", "collection value",
-                "show my nfts", "assets", "investment"
-            ],
-            "memory_valuation": [
-                "how much worth", "appraise", "value this", "price", "evaluate",
-                "market value", "what's it worth"
-            ],
-            "authenticity_check": [
-                "is real", "authentic", "verify", "check authenticity", "fraud",
-                "genuine", "fake detection"
-            ],
-            "trading_assistance": [
-                "buy memory", "sell nft", "trade", "purchase", "marketplace",
-                "estate plan", "inheritance"
-            ],
-            "market_insights": [
-                "market trends", "prices", "demand", "popular memories",
-                "investment advice", "market analysis"
-            ]
+        # Reply formatter per intent; anything unlisted gets the general reply.
+        # Valuation questions go to the Memory Appraiser, like portfolio analysis
+        self._dispatch = {
+            "agent_discovery": self._format_agent_discovery,
+            "portfolio_analysis": self._format_portfolio_query,
+            "memory_valuation": self._format_portfolio_query,
+            "authenticity_check": self._format_authenticity_query,
+            "trading_assistance": self._format_trading_query
         }
         
-        # MeTTa reasoning templates for different intents
-        self.metta_reasoning_templates = {
-            "agent_discovery": {
-                "reasoning_chain": [
-                    "User seeks agent assistance",
-                    "Analyze query for specific capabilities needed", 
-                    "Match capabilities to available agents",
-                    "Rank agents by relevance and confidence",
-                    "Provide discovery response with suggested actions"
-                ],
-                "knowledge_base": "agent_registry_ontology"
-            },
-            "portfolio_analysis": {
-                "reasoning_chain": [
-                    "User wants portfolio insights",
-                    "Route to Memory Appraiser for valuation",
-                    "Consider market trends and rarity factors",
-                    "Generate comprehensive analysis report"
-                ],
-                "knowledge_base": "memory_valuation_ontology"
-            },
-            "authenticity_check": {
-                "reasoning_chain": [
-                    "User questions memory authenticity",
-                    "Route to Authenticity Validator agent",
-                    "Apply multi-agent consensus verification",
-                    "Provide confidence score and reasoning"
-                ],
-                "knowledge_base": "authenticity_verification_ontology"
-            }
-        }
+        # Intent matchers, built once: one automaton over every pattern when
+        # pyahocorasick is available, otherwise one compiled regex per intent
+        self._intent_automaton = None
+        self._intent_res = None
+        if ahocorasick is None:
+            # Per intent, a lookahead alternation (longest first) reports the longest pattern
+            # starting at each offset; patterns that are prefixes of it are present as well
+            self._intent_res = {}
+            for intent, patterns in self.intent_patterns.items():
+                ordered = sorted(set(patterns), key=len, reverse=True)
+                self._intent_res[intent] = (
+                    re.compile("(?=(%s))" % "|".join(map(re.escape, ordered))),
+                    {q: frozenset(p for p in ordered if q.startswith(p)) for q in ordered}
+                )
+        else:
+            # Each automaton hit reports (pattern, intents)
+            pattern_intents = {}
+            for intent, patterns in self.intent_patterns.items():
+                for pattern in patterns:
+                    pattern_intents.setdefault(pattern, []).append(intent)
+            self._intent_automaton = ahocorasick.Automaton()
+            for pattern, intents in pattern_intents.items():
+                self._intent_automaton.add_word(pattern, (pattern, tuple(intents)))
+            self._intent_automaton.make_automaton()
     
     async def process_asi_one_chat(self, request: ASIOneChatRequest) -> ASIOneChatResponse:
         """Process ASI:One chat request with agent discovery"""
+        if request.session_id:
+            self._touch(request.session_id)
+        
+        # Repeat queries are answered from cache until the registry changes
+        cache_key = (request.message, request.include_reasoning, agent_registry.version)
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            self._response_cache.move_to_end(cache_key)
+            # Callers own their response; the cached one is never handed out
+            return cached.model_copy(deep=True)
         
-        # Classify intent
-        intent = self._classify_intent(request.message)
+        intent, relevant_agents = await self._match(request)
+        return await self._complete(request, intent, relevant_agents, cache_key)
+    
+    async def stream_asi_one_chat(self, request: ASIOneChatRequest) -> AsyncIterator[bytes]:
+        """Yield the chat reply as server-sent events: matched agents, reply sections, then the rest"""
+        if request.session_id:
+            self._touch(request.session_id)
+        cache_key = (request.message, request.include_reasoning, agent_registry.version)
+        chat_response = self._response_cache.get(cache_key)
+        if chat_response is None:
+            # Concurrency slots cover the processing only, never a yield to a slow client
+            async with _CHAT_SEM:
+                intent, relevant_agents = await self._match(request)
+            # Clients can show the matched agents while the reply is being formatted
+            yield _sse_event("agents", {"intent": intent, "relevant_agents": relevant_agents})
+            async with _CHAT_SEM:
+                chat_response = await self._complete(request, intent, relevant_agents, cache_key)
+        else:
+            self._response_cache.move_to_end(cache_key)
+            yield _sse_event("agents", {"intent": chat_response.intent, "relevant_agents": chat_response.relevant_agents})
         
-        # Get relevant agents for this intent
-        relevant_agents = agent_registry.discover_agents_by_asi_one_query(request.message)
+        for section in chat_response.response.split("\n\n"):
+            yield _sse_event("content", section)
+        yield _sse_event("done", {
+            "confidence": chat_response.confidence,
+            "suggested_actions": chat_response.suggested_actions,
+            "metta_reasoning": chat_response.metta_reasoning
+        })
+    
+    def _touch(self, session_id: str) -> None:
+        """Mark a session as most recently active, forgetting the oldest past MAX_SESSIONS"""
+        self.session_history[session_id] = None
+        self.session_history.move_to_end(session_id)
+        if len(self.session_history) > MAX_SESSIONS:
+            self.session_history.popitem(last=False)
+    
+    async def _match(self, request: ASIOneChatRequest):
+        """Classify intent and find relevant agents"""
+        # Lowercase once; every pattern matcher works on this copy
+        message_lower = request.message.lower()
         
-        # Generate MeTTa reasoning
-        metta_reasoning = self._generate_metta_reasoning(intent, request.message)
+        # Classify intent and find relevant agents concurrently, off the event loop
+        return await asyncio.gather(
+            _run_in(_FMT_EXEC, self._classify_intent, message_lower),
+            _run_in(_IO_EXEC, agent_registry.discover_agents_by_asi_one_query, request.message)
+        )
+    
+    async def _complete(self, request: ASIOneChatRequest, intent: str, relevant_agents: List[Dict], cache_key: tuple) -> ASIOneChatResponse:
+        """Add reasoning and reply text to a matched request, and cache the result"""
+        # Generate MeTTa reasoning, unless the client opted out of it
+        metta_reasoning = self._generate_metta_reasoning(intent, request.message) if request.include_reasoning else None
         
-        # Generate response based on intent
-        if intent == "agent_discovery":
-            response = await self._handle_agent_discovery(request, relevant_agents)
-        elif intent == "portfolio_analysis":
-            response = await self._handle_portfolio_query(request, relevant_agents)
-        elif intent == "memory_valuation":
-            response = await self._handle_valuation_query(request, relevant_agents)
-        elif intent == "authenticity_check":
-            response = await self._handle_authenticity_query(request, relevant_agents)
-        elif intent == "trading_assistance":
-            response = await self._handle_trading_query(request, relevant_agents)
-        else:
-            response = await self._handle_general_query(request, relevant_agents)
+        # Formatting is plain CPU work; build the reply in a worker thread
+        response = await _run_in(_FMT_EXEC, self._format_reply, intent, request, relevant_agents)
         
-        return ASIOneChatResponse(
+        chat_response = ASIOneChatResponse(
             response=response["content"],
             intent=intent,
             confidence=response["confidence"],
@@ -128,16 +301,31 @@ class EnhancedASIOneClient:
             suggested_actions=response["suggested_actions"],
             metta_reasoning=metta_reasoning
         )
+        self._response_cache[cache_key] = chat_response.model_copy(deep=True)
+        if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+        return chat_response
+    
+    def _format_reply(self, intent: str, request: ASIOneChatRequest, agents: List[Dict]) -> Dict:
+        """Build the reply content for an intent (runs in a worker thread)"""
+        return self._dispatch.get(intent, self._format_general_query)(request, agents)
     
-    def _classify_intent(self, message: str) -> str:
-        """Classify user intent from message"""
-        message_lower = message.lower()
+    def _classify_intent(self, message_lower: str) -> str:
+        """Classify user intent from the already lowercased message"""
+        if self._intent_automaton is not None:
+            # Score = number of distinct patterns present, as in the regex scan below
+            intent_scores = dict.fromkeys(self.intent_patterns, 0)
+            for _, intents in {hit for _, hit in self._intent_automaton.iter(message_lower)}:
+                for intent in intents:
+                    intent_scores[intent] += 1
+            best = max(intent_scores, key=intent_scores.get)
+            return best if intent_scores[best] else "general_inquiry"
         
         intent_scores = {}
-        for intent, patterns in self.intent_patterns.items():
-            score = sum(1 for pattern in patterns if pattern in message_lower)
-            if score > 0:
-                intent_scores[intent] = score
+        for intent, (regex, prefixes) in self._intent_res.items():
+            found = regex.findall(message_lower)
+            if found:
+                intent_scores[intent] = len(frozenset().union(*map(prefixes.__getitem__, found)))
         
         if intent_scores:
             return max(intent_scores.items(), key=lambda x: x[1])[0]
@@ -146,52 +334,46 @@ class EnhancedASIOneClient:
     
     def _generate_metta_reasoning(self, intent: str, query: str) -> Dict[str, Any]:
         """Generate MeTTa reasoning explanation"""
-        template = self.metta_reasoning_templates.get(intent, {})
+        template = self.metta_reasoning_templates.get(intent, self._EMPTY_TEMPLATE)
         
         return {
             "intent_classification": intent,
-            "reasoning_chain": template.get("reasoning_chain", ["General query processing"]),
+            "reasoning_chain": template.get("reasoning_chain", self._DEFAULT_REASONING_CHAIN),
             "knowledge_base_used": template.get("knowledge_base", "general_knowledge"),
-            "confidence_factors": [
-                "Intent pattern matching",
-                "Agent capability alignment", 
-                "Historical query success rate"
-            ],
-            "metta_features_applied": [
-                "Intent recognition ontology",
-                "Agent capability mapping",
-                "User context reasoning"
-            ]
+            **self._METTA_CONST
         }
     
-    async def _handle_agent_discovery(self, request: ASIOneChatRequest, agents: List[Dict]) -> Dict:
+    @staticmethod
+    def _pick_agent(agents: List[Dict], *roles: str) -> Optional[Dict]:
+        """Most relevant of `agents` holding any of the roles, via the registry's role index"""
+        addresses = set().union(*map(agent_registry.find_by_role, roles))
+        return next((a for a in agents if a["address"] in addresses), None)
+    
+    def _format_agent_discovery(self, request: ASIOneChatRequest, agents: List[Dict]) -> Dict:
         """Handle agent discovery requests"""
         registry_summary = agent_registry.get_agent_registry_summary()
         
-        response_content = f"""🤖 **Memory Marketplace Agent Discovery**
-
-I found **{len(agents)}** agents that can help you:
-
-"""
-        
-        # Show top 3 most relevant agents
-        for i, agent in enumerate(agents[:3], 1):
-            response_content += f"""**{i}. {agent['name']}** (Confidence: {agent['confidence']:.1%})
-   📋 {agent['description']}
-   🎯 Webhook: `{agent['webhook']}`
-   💡 Try: "{agent['suggested_queries'][0] if agent.get('suggested_queries') else 'How can you help me?'}"
-
-"""
-        
-        response_content += f"""📊 **System Overview:**
-• Total Agents: {registry_summary['total_agents']} 
-• ASI:One Compatible: {registry_summary['asi_one_compatible']}
-• MeTTa Enabled: {registry_summary['metta_enabled']}
-
-🔍 **Popular Queries:**
-"""
-        for query in registry_summary['sample_queries'][:3]:
-            response_content += f"• \"{query}\"\n"
+        agent_lines = "".join(
+            DISCOVERY_AGENT_TEMPLATE.format_map({
+                "rank": i,
+                "name": agent["name"],
+                "confidence": agent["confidence"],
+                "description": agent["description"],
+                "webhook": agent["webhook"],
+                "try_query": agent["suggested_queries"][0] if agent.get("suggested_queries") else "How can you help me?"
+            })
+            for i, agent in enumerate(agents[:3], 1)  # Show top 3 most relevant agents
+        )
+        response_content = DISCOVERY_TEMPLATE.format_map({
+            "agent_count": len(agents),
+            "agent_lines": agent_lines,
+            "total_agents": registry_summary["total_agents"],
+            "asi_one_compatible": registry_summary["asi_one_compatible"],
+            "metta_enabled": registry_summary["metta_enabled"],
+            "popular_queries": "".join(
+                QUERY_LINE_TEMPLATE.format(query) for query in registry_summary["sample_queries"][:3]
+            )
+        })
         
         return {
             "content": response_content,
@@ -203,9 +385,9 @@ I found **{len(agents)}** agents that can help you:
             ]
         }
     
-    async def _handle_portfolio_query(self, request: ASIOneChatRequest, agents: List[Dict]) -> Dict:
+    def _format_portfolio_query(self, request: ASIOneChatRequest, agents: List[Dict]) -> Dict:
         """Handle portfolio analysis requests"""
-        appraiser_agent = next((a for a in agents if "appraiser" in a['name'].lower()), None)
+        appraiser_agent = self._pick_agent(agents, "appraiser")
         
         response_content = f"""📊 **Portfolio Analysis Request Received**
 
@@ -236,9 +418,9 @@ Connect to the Memory Appraiser at `{appraiser_agent['webhook'] if appraiser_age
             ]
         }
     
-    async def _handle_authenticity_query(self, request: ASIOneChatRequest, agents: List[Dict]) -> Dict:
+    def _format_authenticity_query(self, request: ASIOneChatRequest, agents: List[Dict]) -> Dict:
         """Handle authenticity verification requests"""
-        validator_agent = next((a for a in agents if "authenticity" in a['name'].lower() or "verifier" in a['name'].lower()), None)
+        validator_agent = self._pick_agent(agents, "authenticity", "verifier")
         
         response_content = f"""🔍 **Authenticity Verification Request**
 
@@ -272,9 +454,9 @@ I'll route you to our **Multi-Agent Authenticity Verification System**:
             ]
         }
     
-    async def _handle_trading_query(self, request: ASIOneChatRequest, agents: List[Dict]) -> Dict:
+    def _format_trading_query(self, request: ASIOneChatRequest, agents: List[Dict]) -> Dict:
         """Handle trading and marketplace requests"""
-        trading_agent = next((a for a in agents if "trading" in a['name'].lower() or "market" in a['name'].lower()), None)
+        trading_agent = self._pick_agent(agents, "trading", "market")
         
         response_content = f"""💰 **Memory Trading & Marketplace Services**
 
@@ -309,27 +491,12 @@ Our **Trading & Legacy Agent** can help with:
             ]
         }
     
-    async def _handle_general_query(self, request: ASIOneChatRequest, agents: List[Dict]) -> Dict:
+    def _format_general_query(self, request: ASIOneChatRequest, agents: List[Dict]) -> Dict:
         """Handle general queries"""
-        response_content = f"""🧠 **Memory Marketplace Assistant**
-
-I understand you're looking for help with: "{request.message}"
-
-🤖 **Available Specialized Agents:**
-"""
-        
-        for agent in agents[:2]:
-            response_content += f"• **{agent['name']}**: {agent['description']}\n"
-        
-        response_content += f"""
-💡 **Try These Specific Queries:**
-• "What's my memory collection worth?"
-• "Is this childhood video authentic?" 
-• "Help me buy rare graduation memories"
-• "Create an estate plan for my NFTs"
-
-🔍 **For Agent Discovery:** "Show me available agents"
-"""
+        response_content = GENERAL_TEMPLATE.format_map({
+            "message": request.message,
+            "agent_lines": "".join(GENERAL_AGENT_TEMPLATE.format_map(agent) for agent in agents[:2])
+        })
         
         return {
             "content": response_content,
@@ -345,38 +512,58 @@ I understand you're looking for help with: "{request.message}"
 # Global enhanced ASI:One client
 enhanced_asi_one = EnhancedASIOneClient()
 
+@functools.cache
+def _capabilities_payload() -> Dict[str, Any]:
+    """Capabilities overview; agent_capabilities is a read-only table, so this is built once"""
+    return {
+        "agents": dict(agent_registry.agent_capabilities),
+        "total_capabilities": len(set(
+            cap for agent in agent_registry.agent_capabilities.values()
+            for cap in agent.get("capabilities", [])
+        )),
+        "metta_enabled_features": sum(
+            len(agent.get("metta_features", [])) 
+            for agent in agent_registry.agent_capabilities.values()
+        )
+    }
+
 # FastAPI endpoint for ASI:One Chat Protocol
 def create_asi_one_chat_endpoint(app: FastAPI):
     """Add ASI:One chat endpoint to FastAPI app"""
     
-    @app.post("/asi-one/chat")
+    @app.post("/asi-one/chat", response_model=ASIOneChatResponse)
     async def asi_one_chat_endpoint(request: ASIOneChatRequest):
         """ASI:One Chat Protocol endpoint with agent discovery"""
         try:
-            response = await enhanced_asi_one.process_asi_one_chat(request)
+            async with _CHAT_SEM:
+                response = await enhanced_asi_one.process_asi_one_chat(request)
             return response
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
+    @app.post("/asi-one/chat/stream")
+    async def asi_one_chat_stream_endpoint(request: ASIOneChatRequest):
+        """ASI:One chat as server-sent events, sending matched agents before the full reply"""
+        async def events():
+            try:
+                async for event in enhanced_asi_one.stream_asi_one_chat(request):
+                    yield event
+            except Exception as e:
+                # The 200 status is already sent; report the failure in the stream instead
+                yield _sse_event("error", {"detail": str(e)})
+        return StreamingResponse(events(), media_type="text/event-stream")
+    
     @app.get("/asi-one/agents")
     async def get_available_agents():
         """Get all available agents for ASI:One discovery"""
-        return agent_registry.get_agent_registry_summary()
+        # Rebuilt after registry changes; keep that off the event loop
+        summary = await _run_in(_IO_EXEC, agent_registry.get_agent_registry_summary)
+        return summary
     
     @app.get("/asi-one/capabilities")  
     async def get_agent_capabilities():
         """Get detailed agent capabilities for ASI:One"""
-        return {
-            "agents": agent_registry.agent_capabilities,
-            "total_capabilities": len(set(
-                cap for agent in agent_registry.agent_capabilities.values()
-                for cap in agent.get("capabilities", [])
-            )),
-            "metta_enabled_features": sum(
-                len(agent.get("metta_features", [])) 
-                for agent in agent_registry.agent_capabilities.values()
-            )
-        }
+        return _capabilities_payload()
 
 # Test function
 async def test_enhanced_asi_one():
@@ -388,9 +575,11 @@ async def test_enhanced_asi_one():
         ASIOneChatRequest(message="Help me buy rare memories")
     ]
     
-    for request in test_queries:
+    # The queries are independent; process them concurrently and report in order
+    responses = await asyncio.gather(*map(enhanced_asi_one.process_asi_one_chat, test_queries))
+    
+    for request, response in zip(test_queries, responses):
         print(f"\n🔍 Query: '{request.message}'")
-        response = await enhanced_asi_one.process_asi_one_chat(request)
         print(f"🎯 Intent: {response.intent}")
         print(f"💡 Relevant Agents: {len(response.relevant_agents)}")
         print(f"🧠 MeTTa Reasoning: {len(response.metta_reasoning['reasoning_chain'])} steps")